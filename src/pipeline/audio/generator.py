@@ -1,5 +1,7 @@
 import os
+import re
 import json
+import shutil
 import tempfile
 import subprocess
 from typing import Dict, List, Any, Optional, Tuple
@@ -9,6 +11,21 @@ from google.api_core import exceptions as google_exceptions
 
 from .ssml_builder import SSMLBuilder
 
+try:
+    from mutagen.mp3 import MP3
+    from mutagen import MutagenError
+except ImportError:
+    MP3, MutagenError = None, Exception
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# SSML 마크/태그 패턴 (모듈 로드 시 한 번만 컴파일)
+_SSML_MARK_RE = re.compile(r'<mark name="([^"]+)"\s*/>')
+_SSML_TAG_RE = re.compile(r'<[^>]+>')
+
 class AudioGenerator:
     def __init__(self, config: Dict[str, Any], credentials_path: Optional[str] = None):
         self.config = config
@@ -23,7 +40,12 @@ class AudioGenerator:
         self.silence_duration_s = audio_settings.get("silence_duration_s", 1.0)
         self.punctuation_pause_ms = audio_settings.get("punctuation_pause_ms", {})
         
+        # ffmpeg/ffprobe 실행 파일 경로는 한 번만 찾아서 재사용 (호출마다 PATH 탐색 방지)
+        self._ffmpeg = shutil.which('ffmpeg') or 'ffmpeg'
+        self._ffprobe = shutil.which('ffprobe') or 'ffprobe'
         self.ssml_builder = SSMLBuilder()
+        # (폴더, 길이) -> 이미 생성한 무음 파일 경로
+        self._silence_segments: Dict[Tuple[str, float], str] = {}
         self.client = None
         self._initialize_client(credentials_path)
         
@@ -136,24 +158,47 @@ class AudioGenerator:
         raise Exception(f"최대 재시도 횟수({max_retries})를 초과했습니다.")
 
     def _create_silence_segment(self, duration_seconds: float, output_path: str) -> Optional[str]:
+        """
+        무음 세그먼트를 생성합니다. 같은 폴더/길이의 무음은 한 번만 생성하고 이후에는 그 경로를 반환합니다.
+        (concat 목록에는 같은 파일을 여러 번 넣을 수 있음)
+        """
+        cache_key = (os.path.dirname(os.path.abspath(output_path)), duration_seconds)
+        cached_path = self._silence_segments.get(cache_key)
+        if cached_path and os.path.exists(cached_path):
+            return cached_path
         try:
             command = [
-                'ffmpeg', '-f', 'lavfi', '-i', f'anullsrc=r={self.sample_rate}:cl=mono',
+                self._ffmpeg, '-f', 'lavfi', '-i', f'anullsrc=r={self.sample_rate}:cl=mono',
                 '-t', str(duration_seconds), '-q:a', '9', '-acodec', 'libmp3lame',
                 output_path, '-y'
             ]
             subprocess.run(command, check=True, capture_output=True, text=True)
+            self._silence_segments[cache_key] = output_path
             return output_path
         except Exception as e:
             print(f"❌ 무음 세그먼트 생성 실패: {e}")
             return None
 
+    def _segments_share_format(self, segment_paths: List[str]) -> bool:
+        """MP3 세그먼트들의 (샘플레이트, 채널)이 모두 같은지 확인합니다. 판별할 수 없으면 False."""
+        if MP3 is None:
+            return False
+        formats = set()
+        for path in segment_paths:
+            try:
+                info = MP3(path).info
+            except (MutagenError, OSError):
+                return False
+            formats.add((info.sample_rate, info.channels))
+            if len(formats) > 1:
+                return False
+        return len(formats) == 1
+
     def _merge_audio_segments(self, segment_paths: List[str], output_path: str) -> bool:
         if not segment_paths:
             print("❌ 오디오 병합 실패: 병합할 오디오 세그먼트가 없습니다.")
             return False
         
-        merge_list_path = ""
         try:
             list_content = "".join([f"file '{os.path.abspath(p)}'\n" for p in segment_paths])
             
@@ -161,40 +206,42 @@ class AudioGenerator:
             print(list_content)
             print("------------------------------------")
 
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".txt", encoding='utf-8') as tmp_list_file:
-                tmp_list_file.write(list_content)
-                merge_list_path = tmp_list_file.name
+            # 모든 세그먼트의 샘플레이트/채널이 같으면 재인코딩 없이 스트림 복사
+            if self._segments_share_format(segment_paths):
+                codec_args = ['-c', 'copy']
+            else:
+                codec_args = ['-acodec', 'libmp3lame', '-q:a', '2']
 
+            # concat 목록은 임시 파일 대신 stdin(pipe:0)으로 전달
             command = [
-                'ffmpeg', '-f', 'concat', '-safe', '0', '-i', merge_list_path,
-                '-acodec', 'libmp3lame', '-q:a', '2', output_path, '-y'
+                self._ffmpeg, '-f', 'concat', '-safe', '0', '-protocol_whitelist', 'pipe,file', '-i', 'pipe:0',
+                *codec_args, output_path, '-y'
             ]
             
             print(f"🚀 FFMPEG Command: {' '.join(command)}")
             
-            subprocess.run(command, check=True, capture_output=True, text=True)
-            
-            if os.path.exists(merge_list_path):
-                os.remove(merge_list_path)
+            subprocess.run(command, input=list_content, check=True, capture_output=True, text=True)
             return True
         except subprocess.CalledProcessError as e:
             print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
             print("!!!      FFMPEG ERROR DETECTED     !!!")
             print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
             print(f"❌ 오디오 병합 실패 (FFMPEG stderr):\n{e.stderr}")
-            if os.path.exists(merge_list_path):
-                os.remove(merge_list_path)
             return False
         except Exception as e:
             print(f"❌ 오디오 병합 중 예기치 않은 오류: {e}")
-            if os.path.exists(merge_list_path):
-                os.remove(merge_list_path)
             return False
-    
+
     def _get_accurate_audio_duration(self, audio_path: str) -> float:
         try:
             if not os.path.exists(audio_path): return 0.0
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', audio_path]
+            # mutagen이 있으면 MP3 헤더만 읽어 길이를 구하고, ffprobe 프로세스 생성은 실패 시에만
+            if MP3 is not None and audio_path.lower().endswith('.mp3'):
+                try:
+                    return round(float(MP3(audio_path).info.length), 3)
+                except MutagenError:
+                    pass
+            cmd = [self._ffprobe, '-v', 'quiet', '-print_format', 'json', '-show_format', audio_path]
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             return round(float(json.loads(result.stdout)['format']['duration']), 3)
         except Exception:
@@ -208,88 +255,54 @@ class AudioGenerator:
 
     def _save_timing_file(self, timing_info: List[Dict[str, Any]], output_path: str):
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(timing_info, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(timing_info, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump는 토큰마다 write를 호출하므로 한 번에 직렬화 후 한 번에 기록
+            payload = json.dumps(timing_info, ensure_ascii=False, indent=2).encode('utf-8')
+            with open(output_path, 'wb') as f:
+                f.write(payload)
         print(f"💾 타이밍 파일 저장: {output_path} ({len(timing_info)}개 마크)")
 
     def _calculate_manual_timing(self, ssml_text: str, total_duration: float) -> List[Dict[str, Any]]:
         """SSML에서 마크를 추출하고 수동으로 타이밍을 계산합니다."""
-        import re
-        
-        # SSML에서 마크 추출
-        mark_pattern = r'<mark name="([^"]+)"\s*/>'
-        marks = re.findall(mark_pattern, ssml_text)
-        
-        if not marks:
-            return []
-        
-        # 텍스트 길이 기반으로 대략적인 타이밍 계산
-        # 전체 텍스트에서 각 마크까지의 비율을 계산
-        text_content = re.sub(r'<[^>]+>', '', ssml_text)  # 태그 제거
-        text_length = len(text_content)
-        
+        return self._calculate_mark_timepoints(ssml_text, total_duration)
+
+    def _calculate_text_mode_timing(self, ssml_text: str, total_duration: float) -> List[Dict[str, Any]]:
+        """텍스트 모드에서 대략적인 타이밍을 계산합니다."""
+        return self._calculate_mark_timepoints(ssml_text, total_duration)
+
+    def _calculate_mark_timepoints(self, ssml_text: str, total_duration: float) -> List[Dict[str, Any]]:
+        """
+        각 마크까지의 (태그 제외) 텍스트 길이 비율로 타이밍을 계산합니다.
+        마크마다 앞부분 전체를 다시 검색/치환하지 않고, 한 번의 finditer 순회로 누적 길이를 구합니다.
+        """
+        text_length = len(_SSML_TAG_RE.sub('', ssml_text))  # 태그 제거
+
         timepoints = []
+        first_positions = {}
+        consumed = 0
         current_position = 0
-        
-        for i, mark_name in enumerate(marks):
-            # 마크까지의 텍스트 길이 계산 (대략적)
-            mark_position = ssml_text.find(f'<mark name="{mark_name}"')
-            if mark_position != -1:
-                text_before_mark = ssml_text[:mark_position]
-                text_before_mark = re.sub(r'<[^>]+>', '', text_before_mark)
-                current_position = len(text_before_mark)
-            
+        for match in _SSML_MARK_RE.finditer(ssml_text):
+            # 구간 경계가 항상 태그 시작이므로 구간별 태그 제거 결과의 합은 앞부분 전체 제거 결과와 같음
+            current_position += len(_SSML_TAG_RE.sub('', ssml_text[consumed:match.start()]))
+            consumed = match.start()
+            mark_name = match.group(1)
+            # 같은 이름의 마크는 첫 번째 위치 기준 (기존 str.find 동작 유지)
+            mark_position = first_positions.setdefault(mark_name, current_position)
+
             # 비율 기반 타이밍 계산
             if text_length > 0:
-                time_ratio = current_position / text_length
-                time_seconds = total_duration * time_ratio
+                time_seconds = total_duration * (mark_position / text_length)
             else:
                 time_seconds = 0.0
-            
+
             timepoints.append({
                 "mark_name": mark_name,
                 "time_seconds": round(time_seconds, 3)
             })
-        
-        return timepoints
 
-    def _calculate_text_mode_timing(self, ssml_text: str, total_duration: float) -> List[Dict[str, Any]]:
-        """텍스트 모드에서 대략적인 타이밍을 계산합니다."""
-        import re
-        
-        # SSML에서 마크 추출
-        mark_pattern = r'<mark name="([^"]+)"\s*/>'
-        marks = re.findall(mark_pattern, ssml_text)
-        
-        if not marks:
-            return []
-        
-        # 텍스트에서 마크 위치 기반으로 타이밍 계산
-        text_content = re.sub(r'<[^>]+>', '', ssml_text)  # 태그 제거
-        text_length = len(text_content)
-        
-        timepoints = []
-        
-        for mark_name in marks:
-            # 마크까지의 텍스트 길이 계산
-            mark_position = ssml_text.find(f'<mark name="{mark_name}"')
-            if mark_position != -1:
-                text_before_mark = ssml_text[:mark_position]
-                text_before_mark = re.sub(r'<[^>]+>', '', text_before_mark)
-                current_position = len(text_before_mark)
-                
-                # 비율 기반 타이밍 계산 (더 정확한 계산)
-                if text_length > 0:
-                    time_ratio = current_position / text_length
-                    time_seconds = total_duration * time_ratio
-                else:
-                    time_seconds = 0.0
-                
-                timepoints.append({
-                    "mark_name": mark_name,
-                    "time_seconds": round(time_seconds, 3)
-                })
-        
         return timepoints
 
     def get_api_stats(self) -> Dict[str, Any]:
@@ -309,10 +322,8 @@ class AudioGenerator:
 
     def _synthesize_speech_fallback(self, ssml_text: str, output_path: str, voice_name: str = None, lang_code: str = None) -> Tuple[float, List[Dict[str, Any]]]:
         """SSML 미지원 화자에 대한 텍스트 폴백 처리"""
-        import re
-        
         # SSML에서 순수 텍스트만 추출
-        plain_text = re.sub(r'<[^>]+>', '', ssml_text)
+        plain_text = _SSML_TAG_RE.sub('', ssml_text)
         plain_text = plain_text.strip()
         
         print(f"  Fallback: Using plain text mode")
@@ -380,6 +391,18 @@ class AudioGenerator:
         # 모든 재시도가 실패한 경우
         raise Exception(f"텍스트 모드에서 최대 재시도 횟수({max_retries})를 초과했습니다.")
 
+    def _cleanup_temp_dir(self, temp_dir: str):
+        """임시 폴더를 한 번의 scandir 순회로 정리합니다. (DirEntry의 캐시된 타입 정보 사용)"""
+        try:
+            with os.scandir(temp_dir) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        try: os.unlink(entry.path)
+                        except OSError: pass
+            os.rmdir(temp_dir)
+        except OSError:
+            pass
+
     def generate_conversation_audio(self, manifest_data: Dict[str, Any]) -> Dict[str, Any]:
         identifier = manifest_data.get("identifier", "default")
         project_name = manifest_data.get("project_name", "default_project")
@@ -429,8 +452,9 @@ class AudioGenerator:
                         
                         # Add silence
                         silence_path = os.path.join(temp_dir, f"silence_{i}_n.mp3")
-                        if self._create_silence_segment(self.silence_duration_s, silence_path):
-                            segment_paths.append(silence_path)
+                        silence_segment = self._create_silence_segment(self.silence_duration_s, silence_path)
+                        if silence_segment:
+                            segment_paths.append(silence_segment)
                             segment_duration += self.silence_duration_s
 
                         image_filename = f"{identifier}_conversation_{scene_num:03d}_screen1.png"
@@ -473,8 +497,9 @@ class AudioGenerator:
 
                                 # Add silence AFTER EVERY LEARNER
                                 silence_path = os.path.join(temp_dir, f"silence_{i}_l{j}.mp3")
-                                if self._create_silence_segment(self.silence_duration_s, silence_path):
-                                    segment_paths.append(silence_path)
+                                silence_segment = self._create_silence_segment(self.silence_duration_s, silence_path)
+                                if silence_segment:
+                                    segment_paths.append(silence_segment)
                                     segment_duration += self.silence_duration_s
                                 
                                 timing_entry = {
@@ -517,17 +542,15 @@ class AudioGenerator:
                 "ssml_file": final_ssml_path, 
                 "timing_file": timing_file_path, 
                 "timing_info": timing_info,
+                "expected_segments": expected_segments,
+                "successful_segments": successful_segments,
                 "api_stats": self.get_api_stats()
             }
 
         except Exception as e:
             return {"success": False, "error": str(e)}
         finally:
-            for f in os.listdir(temp_dir): 
-                try: os.remove(os.path.join(temp_dir, f)) 
-                except: pass
-            try: os.rmdir(temp_dir) 
-            except: pass
+            self._cleanup_temp_dir(temp_dir)
 
     def generate_intro_ending_audio(self, manifest_data: Dict[str, Any], script_type: str) -> Dict[str, Any]:
         identifier = manifest_data.get("identifier", "default")
@@ -550,6 +573,9 @@ class AudioGenerator:
         segment_counter = 1
         temp_dir = tempfile.mkdtemp(prefix=f"{script_type}_audio_")
 
+        expected_segments = 0
+        successful_segments = 0
+
         try:
             voice = self.tts_config.get("native_voice")
             lang_code = self.tts_config.get("native_lang_code")
@@ -558,11 +584,13 @@ class AudioGenerator:
             for i, scene in enumerate(scenes):
                 text = scene.get('text', '').strip()
                 if text:
+                    expected_segments += 1
                     ssml = self.ssml_builder.build_ssml_with_marks(text, lang_code, f"s{i}", self.punctuation_pause_ms)
                     path = os.path.join(temp_dir, f"seg_{i}.mp3")
                     duration, _ = self._synthesize_speech(ssml, path, voice, lang_code)
 
                     if duration > 0:
+                        successful_segments += 1
                         segment_paths.append(path)
                         full_ssml_content += ssml + "\n"
                         
@@ -570,8 +598,9 @@ class AudioGenerator:
                         
                         # 무음 추가
                         silence_path = os.path.join(temp_dir, f"silence_{i}.mp3")
-                        if self._create_silence_segment(self.silence_duration_s, silence_path):
-                            segment_paths.append(silence_path)
+                        silence_segment = self._create_silence_segment(self.silence_duration_s, silence_path)
+                        if silence_segment:
+                            segment_paths.append(silence_segment)
                             segment_duration += self.silence_duration_s
                         
                         # 이미지 파일명 생성
@@ -611,14 +640,12 @@ class AudioGenerator:
                 "ssml_file": final_ssml_path, 
                 "timing_file": timing_file_path, 
                 "timing_info": timing_info,
+                "expected_segments": expected_segments,
+                "successful_segments": successful_segments,
                 "api_stats": self.get_api_stats()
             }
 
         except Exception as e:
             return {"success": False, "error": str(e)}
         finally:
-            for f in os.listdir(temp_dir): 
-                try: os.remove(os.path.join(temp_dir, f)) 
-                except: pass
-            try: os.rmdir(temp_dir) 
-            except: pass
+            self._cleanup_temp_dir(temp_dir)
@@ -6,8 +6,11 @@ Manifest부터 최종 MP4까지 전체 파이프라인을 관리하고 조율합
 
 import os
 import json
+import hashlib
 import time
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
@@ -17,6 +20,11 @@ from ..audio import AudioGenerator
 from ..steps.create_subtitles import run as create_subtitles_run
 from ..core.context import PipelineContext
 from .renderer import FFmpegRenderer
+from ..video.generator import FFMPEG_MAX_JOBS, SEGMENT_FORMAT_ARGS, ffmpeg_threads_per_job
+
+# 프로젝트 출력 폴더(output/<project>/<identifier>) 아래의 고정 하위 폴더 구성
+PROJECT_LAYOUT = ('manifest', 'mp3', 'timing', 'mp4')
+
 
 @dataclass
 class PipelineConfig:
@@ -24,18 +32,31 @@ class PipelineConfig:
     enable_audio_generation: bool = True
     enable_subtitle_generation: bool = True
     enable_video_rendering: bool = True
+    pretty_json: bool = False  # True면 매니페스트를 사람이 읽기 쉬운 형태(indent=2)로 저장
 
 class PipelineManager:
     def __init__(self, pipeline_config: Optional[PipelineConfig] = None, root=None, log_callback=None):
         self.root = root
-        self.log_callback = log_callback if log_callback else print
+        self._raw_log_callback = log_callback if log_callback else print
+        self._log_lock = threading.Lock()
         self.config = pipeline_config if isinstance(pipeline_config, PipelineConfig) else PipelineConfig()
         self.manifest_parser = ManifestParser()
         self.audio_generator = None
         self.ffmpeg_renderer = FFmpegRenderer()
+
+    def log_callback(self, *args):
+        """여러 작업 스레드에서 호출되어도 로그가 섞이지 않도록 직렬화합니다."""
+        with self._log_lock:
+            self._raw_log_callback(*args)
     
-    def _create_audio_generator(self, project_name: str, identifier: str):
-        """오디오 생성기를 동적으로 생성하고, 항상 UI와 config.json의 현재 설정을 사용합니다."""
+    def _ensure_project_layout(self, output_dir: str):
+        """프로젝트 출력 폴더와 고정 하위 폴더를 부모부터 한 번에 생성합니다."""
+        os.makedirs(output_dir, exist_ok=True)
+        for sub_dir in PROJECT_LAYOUT:
+            os.makedirs(os.path.join(output_dir, sub_dir), exist_ok=True)
+
+    def _build_audio_generator_config(self) -> Dict[str, Any]:
+        """UI와 config.json의 현재 설정으로 AudioGenerator 설정을 구성합니다."""
         # 1. Load base audio settings from config.json
         try:
             config_path = os.path.join(config.BASE_DIR, 'config.json')
@@ -76,8 +97,17 @@ class PipelineManager:
         else:
             self.log_callback("⚠️ '화자 선택' 탭을 찾을 수 없어 화자 정보를 설정할 수 없습니다.", "WARNING")
 
+        return audio_generator_config
+
+    def _create_audio_generator(self, project_name: str, identifier: str, audio_generator_config: Optional[Dict[str, Any]] = None) -> AudioGenerator:
+        """오디오 생성기를 동적으로 생성하고, 항상 UI와 config.json의 현재 설정을 사용합니다."""
+        if audio_generator_config is None:
+            audio_generator_config = self._build_audio_generator_config()
+
         # 4. Initialize the AudioGenerator with the combined config
-        self.audio_generator = AudioGenerator(audio_generator_config, config.GOOGLE_CREDENTIALS_PATH)
+        audio_generator = AudioGenerator(audio_generator_config, config.GOOGLE_CREDENTIALS_PATH)
+        self.audio_generator = audio_generator
+        return audio_generator
 
     def _display_api_stats(self, api_stats: dict):
         """API 호출 통계를 UI에 표시합니다."""
@@ -106,8 +136,8 @@ class PipelineManager:
             if ssml_fallback_calls > 0:
                 stats_message += f"\n🔄 {ssml_fallback_calls}개의 화자가 SSML을 지원하지 않아 텍스트 모드로 전환되었습니다."
             
-            # UI에 로그 메시지로 표시
-            self.root.pages['data'].log_message(stats_message)
+            # UI에 로그 메시지로 표시 (작업 스레드에서 호출되므로 위젯을 직접 건드리지 않고 로그 버퍼로 전달)
+            self.log_callback(stats_message)
             
         except Exception as e:
             print(f"API 통계 표시 중 오류: {e}")
@@ -122,7 +152,7 @@ class PipelineManager:
                 return {'success': False, 'errors': ['프로젝트명과 식별자가 필요합니다.']}
             
             output_dir = os.path.join("output", project_name, identifier)
-            os.makedirs(output_dir, exist_ok=True)
+            self._ensure_project_layout(output_dir)
             
             # 'all' 타입일 경우 마스터 매니페스트를 생성하도록 _create_manifest 호출
             manifest_path, _ = self._create_manifest(project_name, identifier, script_type, output_dir, ui_data)
@@ -133,7 +163,7 @@ class PipelineManager:
             
         except Exception as e:
             return {'success': False, 'errors': [f'매니페스트 생성 중 오류: {str(e)}']}
-    def run_audio_generation(self, ui_data: Dict[str, Any]) -> Dict[str, Any]:
+    def run_audio_generation(self, ui_data: Dict[str, Any], audio_generator_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         try:
             project_name = ui_data.get('project_name', '')
             identifier = ui_data.get('identifier', '')
@@ -150,12 +180,6 @@ class PipelineManager:
                 self.log_callback("❌ 오디오 생성 실패: Manifest 데이터 생성에 실패했습니다.")
                 return {'success': False, 'errors': ['Manifest 데이터 생성 실패']}
 
-            # 2. 오디오 생성기 준비
-            self._create_audio_generator(project_name, identifier)
-            audio_output_dir = os.path.join(output_dir, "mp3")
-            os.makedirs(audio_output_dir, exist_ok=True)
-
-            # 3. 스크립트 타입에 따라 적절한 오디오 생성 함수 호출
             scenes = manifest_data.get('scenes', [])
             scenes_for_type = [s for s in scenes if s.get('type') == script_type]
             manifest_data_for_type = manifest_data.copy()
@@ -165,17 +189,30 @@ class PipelineManager:
                 self.log_callback(f"⚠️ {script_type} 타입의 장면이 없어 오디오 생성을 건너뜁니다.")
                 return {'success': True} # It's not an error, just nothing to do
 
+            # 2. 스크립트와 음성 설정이 이전 실행과 동일하면 TTS를 다시 호출하지 않음
+            if audio_generator_config is None:
+                audio_generator_config = self._build_audio_generator_config()
+            audio_hash = self._compute_audio_hash(manifest_data_for_type, audio_generator_config)
+            cached_result = self._load_stage_cache(output_dir, 'audio', script_type, audio_hash)
+            if cached_result:
+                self.log_callback(f"♻️ {script_type} 스크립트와 음성 설정이 변경되지 않아 기존 오디오를 재사용합니다.")
+                return cached_result
+
+            # 3. 오디오 생성기 준비 (병렬 실행 시 호출마다 독립된 인스턴스 사용)
+            audio_generator = self._create_audio_generator(project_name, identifier, audio_generator_config)
+
+            # 4. 스크립트 타입에 따라 적절한 오디오 생성 함수 호출
+
             if script_type == "conversation":
-                audio_result = self.audio_generator.generate_conversation_audio(manifest_data_for_type)
+                audio_result = audio_generator.generate_conversation_audio(manifest_data_for_type)
             elif script_type in ["intro", "ending", "title", "keywords"]:
-                audio_result = self.audio_generator.generate_intro_ending_audio(manifest_data_for_type, script_type)
+                audio_result = audio_generator.generate_intro_ending_audio(manifest_data_for_type, script_type)
             else:
                 self.log_callback(f"❌ 오디오 생성 실패: 지원하지 않는 스크립트 타입: {script_type}")
                 return {'success': False, 'errors': [f'지원하지 않는 스크립트 타입: {script_type}']}
 
             if not audio_result.get('success'):
-                if self.root and hasattr(self.root, 'pages') and 'data' in self.root.pages:
-                    self.root.pages['data'].log_message(f"❌ 오디오 생성 실패: {audio_result.get('error', '알 수 없는 오류')}")
+                self.log_callback(f"❌ 오디오 생성 실패: {audio_result.get('error', '알 수 없는 오류')}")
                 return {'success': False, 'errors': [f'오디오 생성 실패: {audio_result.get("error", "알 수 없는 오류")}']}
 
             audio_path = audio_result.get('audio_file')
@@ -184,41 +221,142 @@ class PipelineManager:
             
             # 디버깅: API 통계 확인
             print(f"🔍 디버깅 - API 통계: {api_stats}")
-            print(f"🔍 디버깅 - root 존재: {self.root is not None}")
-            if self.root:
-                print(f"🔍 디버깅 - pages 존재: {hasattr(self.root, 'pages')}")
-                if hasattr(self.root, 'pages'):
-                    print(f"🔍 디버깅 - data 페이지 존재: {'data' in self.root.pages}")
             
             # API 통계를 UI에 표시
-            if api_stats and self.root and hasattr(self.root, 'pages') and 'data' in self.root.pages:
-                print("🔍 디버깅 - API 통계 표시 시도")
+            if api_stats:
                 self._display_api_stats(api_stats)
-            else:
-                print("🔍 디버깅 - API 통계 표시 조건 미충족")
             
             if audio_path: # timing_info는 현재 빈 리스트이므로 조건에서 제외
-                timing_output_dir = os.path.join(output_dir, "timing")
-                os.makedirs(timing_output_dir, exist_ok=True)
-                timing_path = os.path.join(timing_output_dir, f"{identifier}_{script_type}.json")
-                
-                # timing_info가 비어있더라도 파일은 생성할 수 있도록 로직 변경
-                with open(timing_path, 'w', encoding='utf-8') as f:
-                    json.dump(timing_info, f, ensure_ascii=False, indent=2)
-
-                if self.root and hasattr(self.root, 'pages') and 'data' in self.root.pages:
-                    self.root.pages['data'].log_message(f"✅ {script_type.capitalize()} 오디오 생성 완료: {audio_path}")
-                return {'success': True, 'generated_files': {'audio': audio_path, 'timing': timing_path}}
+                # AudioGenerator가 이미 저장한 타이밍 파일을 그대로 사용 (같은 내용을 다시 쓰지 않음)
+                timing_path = audio_result.get('timing_file')
+                if not timing_path:
+                    timing_output_dir = os.path.join(output_dir, "timing")
+                    os.makedirs(timing_output_dir, exist_ok=True)
+                    timing_path = os.path.join(timing_output_dir, f"{identifier}_{script_type}.json")
+                    
+                    # timing_info가 비어있더라도 파일은 생성할 수 있도록 로직 변경
+                    with open(timing_path, 'w', encoding='utf-8') as f:
+                        json.dump(timing_info, f, ensure_ascii=False, indent=2)
+
+                self.log_callback(f"✅ {script_type.capitalize()} 오디오 생성 완료: {audio_path}")
+                result = {'success': True, 'generated_files': {'audio': audio_path, 'timing': timing_path}}
+                # 일부 TTS 호출이 실패해 세그먼트가 빠진 결과는 캐시하지 않음 (다음 실행에서 다시 생성)
+                expected_segments = audio_result.get('expected_segments')
+                complete = (api_stats.get('failed_calls', 0) == 0
+                            and expected_segments is not None
+                            and audio_result.get('successful_segments') == expected_segments)
+                if complete:
+                    self._save_stage_cache(output_dir, 'audio', script_type, audio_hash, result)
+                else:
+                    self._invalidate_stage_cache(output_dir, 'audio', script_type)
+                    self.log_callback(f"⚠️ {script_type} 오디오 일부 세그먼트가 생성되지 않아 결과를 캐시하지 않습니다.")
+                return result
             else:
-                if self.root and hasattr(self.root, 'pages') and 'data' in self.root.pages:
-                    self.root.pages['data'].log_message("❌ 오디오 생성 실패: 오디오 파일 경로를 찾을 수 없습니다.")
+                self.log_callback("❌ 오디오 생성 실패: 오디오 파일 경로를 찾을 수 없습니다.")
                 return {'success': False, 'errors': ['오디오 생성 실패']}
             
         except Exception as e:
-            if self.root and hasattr(self.root, 'pages') and 'data' in self.root.pages:
-                self.root.pages['data'].log_message(f"❌ 오디오 생성 중 오류: {str(e)}")
+            self.log_callback(f"❌ 오디오 생성 중 오류: {str(e)}")
             return {'success': False, 'errors': [f'오디오 생성 중 오류: {str(e)}']}
 
+    def _compute_audio_hash(self, manifest_data: Dict[str, Any], audio_generator_config: Dict[str, Any]) -> str:
+        """오디오 결과에 영향을 주는 입력(장면 텍스트, 음성/오디오 설정)의 SHA-256 해시"""
+        # 장면의 이미지 설정(settings)은 오디오와 무관하므로 제외
+        scenes = [{k: v for k, v in scene.items() if k != 'settings'} for scene in manifest_data.get('scenes', [])]
+        key_data = {
+            'scenes': scenes,
+            'tts': audio_generator_config.get('tts', {}),
+            'audio_settings': audio_generator_config.get('audio_settings', {}),
+        }
+        payload = json.dumps(key_data, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _stage_cache_path(self, output_dir: str, stage: str, script_type: str) -> str:
+        return os.path.join(output_dir, ".cache", f"{stage}_{script_type}.json")
+
+    def _load_stage_cache(self, output_dir: str, stage: str, script_type: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """해시가 같고 결과 파일이 모두 남아 있으면 이전 단계(audio/video) 결과를 반환합니다."""
+        cache_path = self._stage_cache_path(output_dir, stage, script_type)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if cache.get('hash') != input_hash:
+            # 이번 실행이 결과 파일을 덮어쓰므로, 중간에 실패해도 이전 해시로 재사용되지 않게 항목을 지움
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+        result = cache.get('result', {})
+        generated_files = result.get('generated_files', {})
+        if not generated_files or not all(p and os.path.exists(p) for p in generated_files.values()):
+            return None
+        return result
+
+    def _invalidate_stage_cache(self, output_dir: str, stage: str, script_type: str):
+        """단계 캐시 항목 삭제 (불완전한 결과가 재사용되지 않도록)"""
+        try:
+            os.remove(self._stage_cache_path(output_dir, stage, script_type))
+        except OSError:
+            pass
+
+    def _save_stage_cache(self, output_dir: str, stage: str, script_type: str, input_hash: str, result: Dict[str, Any]):
+        cache_path = self._stage_cache_path(output_dir, stage, script_type)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'hash': input_hash, 'result': result}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ {stage} 캐시 저장 실패: {e}")
+
+    def _compute_render_hash(self, timing_path: str, image_dir: str, audio_path: str) -> str:
+        """
+        비디오 결과에 영향을 주는 입력의 해시
+        (타이밍 JSON, 자막 이미지 이름/크기/수정 시각, 오디오 파일 크기/수정 시각, 인코더/출력 형식)
+        자막 이미지는 내용을 읽지 않고 stat 정보만 사용합니다. (PNGRenderer는 내용이 같으면 파일을 다시 쓰지 않음)
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(timing_path, 'rb') as f:
+            digest.update(f.read())
+        for entry in sorted(os.scandir(image_dir), key=lambda e: e.name):
+            if entry.is_file():
+                st = entry.stat()
+                digest.update(f"{entry.name}:{st.st_mtime_ns}:{st.st_size}\n".encode('utf-8'))
+        try:
+            st = os.stat(audio_path)
+            digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            pass
+        digest.update(repr((self.ffmpeg_renderer.video_generator.h264_encoder, SEGMENT_FORMAT_ARGS)).encode())
+        return digest.hexdigest()
+
+    def run_audio_generation_parallel(self, ui_data_by_type: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 스크립트 타입(intro/conversation/ending)의 오디오를 동시에 생성합니다.
+
+        각 타입의 TTS 호출과 ffmpeg 처리는 서로 독립적인 I/O 대기 작업이므로
+        스레드 풀에서 병렬로 실행합니다. 화자 설정은 UI에서 한 번만 읽어 공유합니다.
+        """
+        if not ui_data_by_type:
+            return {}
+
+        audio_generator_config = self._build_audio_generator_config()
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(ui_data_by_type)) as executor:
+            futures = {
+                executor.submit(self.run_audio_generation, step_ui_data, audio_generator_config): script_type
+                for script_type, step_ui_data in ui_data_by_type.items()
+            }
+            for future in as_completed(futures):
+                script_type = futures[future]
+                try:
+                    results[script_type] = future.result()
+                except Exception as e:
+                    results[script_type] = {'success': False, 'errors': [f'오디오 생성 중 오류: {str(e)}']}
+        return results
+
     def run_subtitle_creation(self, ui_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             project_name = ui_data.get('project_name', '')
@@ -237,6 +375,11 @@ class PipelineManager:
             
             # 2. 컨텍스트 생성 및 실행
             from src.pipeline.core.context import PipelineContext, PipelinePaths, PipelineSettings
+
+            # 파싱과 검증은 한 번만 수행하고, 경고는 그 결과에서 바로 출력
+            manifest, validation_result = self.manifest_parser.parse_dict_with_result(manifest_data)
+            for warning in validation_result.warnings:
+                self.log_callback(f"⚠️ Manifest 경고: {warning.message}")
             
             script_settings = ui_data.get('script_settings', {})
             context_settings = PipelineSettings(script_settings=script_settings)
@@ -250,7 +393,7 @@ class PipelineManager:
             context = PipelineContext(
                 project_name=project_name,
                 identifier=identifier,
-                manifest=self.manifest_parser.parse_dict(manifest_data),
+                manifest=manifest,
                 settings=context_settings,
                 paths=context_paths,
                 script_type=script_type,
@@ -288,10 +431,41 @@ class PipelineManager:
         except Exception as e:
             return {'success': False, 'errors': [f'비디오 렌더링 중 오류: {str(e)}']}
 
+    def run_timing_based_video_rendering_parallel(self, ui_data_by_type: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 스크립트 타입의 비디오를 동시에 렌더링합니다.
+
+        타입마다 독립된 ffmpeg 프로세스를 실행하므로 전체 시간이 타입별 시간의 합이 아닌 최댓값에 가까워집니다.
+        동시 실행 수는 ffmpeg 동시 실행 슬롯 수(FFMPEG_MAX_JOBS)에 맞춰 제한하고,
+        각 렌더링의 ffmpeg 스레드 수는 코어를 동시 실행 수로 나눈 값으로 고정합니다.
+        """
+        if not ui_data_by_type:
+            return {}
+
+        max_workers = min(len(ui_data_by_type), FFMPEG_MAX_JOBS)
+
+        def render(step_ui_data):
+            with ffmpeg_threads_per_job(max_workers):
+                return self.run_timing_based_video_rendering(step_ui_data)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(render, step_ui_data): script_type
+                for script_type, step_ui_data in ui_data_by_type.items()
+            }
+            for future in as_completed(futures):
+                script_type = futures[future]
+                try:
+                    results[script_type] = future.result()
+                except Exception as e:
+                    results[script_type] = {'success': False, 'message': f'오류: {e}'}
+        return results
+
     def _create_manifest(self, project_name: str, identifier: str, script_type: str, output_dir: str, ui_data: Dict = None) -> Optional[Tuple[str, Dict]]:
         try:
+            self._ensure_project_layout(output_dir)
             manifest_dir = os.path.join(output_dir, "manifest")
-            os.makedirs(manifest_dir, exist_ok=True)
 
             # 'all' 타입에 따라 파일명 분기
             manifest_filename = f"{identifier}_main.json" if script_type == 'all' else f"{identifier}_{script_type}.json"
@@ -332,8 +506,12 @@ class PipelineManager:
 
             manifest_data["scenes"] = all_scenes
 
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest_data, f, ensure_ascii=False, indent=2)
+            # 매니페스트는 기계가 읽는 파일이므로 기본은 압축 출력, 디버깅 시에만 pretty 출력
+            indent = 2 if self.config.pretty_json else None
+            separators = None if self.config.pretty_json else (',', ':')
+            payload = json.dumps(manifest_data, ensure_ascii=False, indent=indent, separators=separators).encode('utf-8')
+            with open(manifest_path, 'wb') as f:
+                f.write(payload)
             
             return manifest_path, manifest_data
             
@@ -622,8 +800,8 @@ class PipelineManager:
     
     def _render_video(self, manifest_path: Optional[str], audio_path: Optional[str], subtitle_dir: Optional[str], output_dir: str, script_type: str) -> Optional[Dict[str, str]]:
         try:
+            self._ensure_project_layout(output_dir)
             video_dir = os.path.join(output_dir, "mp4")
-            os.makedirs(video_dir, exist_ok=True)
             
             project_name = os.path.basename(os.path.dirname(output_dir))
             identifier = os.path.basename(output_dir)
@@ -708,8 +886,8 @@ class PipelineManager:
                 return {"success": False, "message": "프로젝트, 식별자, 스크립트 타입이 필요합니다."}
             
             output_dir = f"output/{project_name}/{identifier}"
+            self._ensure_project_layout(output_dir)
             video_dir = os.path.join(output_dir, "mp4")
-            os.makedirs(video_dir, exist_ok=True)
             
             generated_videos = {}
             errors = []
@@ -729,10 +907,20 @@ class PipelineManager:
                     errors.append(f"{script_type} 이미지 디렉토리를 찾을 수 없습니다: {image_dir}")
                     continue
                 
+                # 타이밍/자막 이미지/오디오/인코딩 설정이 이전 실행과 같으면 다시 렌더링하지 않음
+                audio_path = os.path.join(output_dir, "mp3", f"{identifier}_{script_type}.mp3")
+                render_hash = self._compute_render_hash(timing_path, image_dir, audio_path)
+                if self._load_stage_cache(output_dir, 'video', script_type, render_hash):
+                    self.log_callback(f"♻️ {script_type} 입력이 변경되지 않아 기존 비디오를 재사용합니다.")
+                    generated_videos[script_type] = output_video_path
+                    continue
+
                 success = self.ffmpeg_renderer.create_video_from_timing(timing_path, output_video_path, image_dir, script_type)
                 
                 if success and os.path.exists(output_video_path):
                     generated_videos[script_type] = output_video_path
+                    self._save_stage_cache(output_dir, 'video', script_type, render_hash,
+                                           {'success': True, 'generated_files': {'video': output_video_path}})
                 else:
                     errors.append(f"{script_type} 비디오 생성 실패")
             
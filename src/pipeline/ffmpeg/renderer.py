@@ -3,8 +3,56 @@
 
 import os
 import json
+import shutil
+import subprocess
+import traceback
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
-from ..video.generator import VideoGenerator
+from ..video.generator import (
+    SEGMENT_FORMAT_ARGS, VideoGenerator, h264_encoder_args, log_ffmpeg_command, mp4_output_args, run_ffmpeg_job,
+)
+
+
+# 스무스 전환 병합용 필터 그래프 (비디오만 xfade로 전환, 오디오는 순차 연결)
+_XFADE_2_TEMPLATE = (
+    "[0:v]trim=start=0.001,setpts=PTS-STARTPTS[v0];[1:v]setpts=PTS-STARTPTS[v1];"
+    "[v0][v1]xfade=transition=dissolve:duration=1.0:offset={offset1}[v]"
+)
+_XFADE_3_TEMPLATE = (
+    "[0:v]trim=start=0.001,setpts=PTS-STARTPTS[v0];[1:v]setpts=PTS-STARTPTS[v1];[2:v]setpts=PTS-STARTPTS[v2];"
+    "[v0][v1]xfade=transition=dissolve:duration=1.0:offset={offset1}[v01];"
+    "[v01][v2]xfade=transition=dissolve:duration=1.0:offset={offset2}[v]"
+)
+_AUDIO_CONCAT_2 = "[0:a][1:a]concat=n=2:v=0:a=1[a]"
+_AUDIO_CONCAT_3 = "[0:a][1:a][2:a]concat=n=3:v=0:a=1[a]"
+
+
+def _build_concat_list(video_paths: List[str]) -> str:
+    """ffmpeg concat demuxer용 목록 텍스트 (절대 경로, 작은따옴표 이스케이프)"""
+    lines = []
+    for video_path in video_paths:
+        safe_path = os.path.abspath(video_path).replace("'", "'\\''")
+        lines.append(f"file '{safe_path}'\n")
+    return "".join(lines)
+
+
+def _is_nonempty_file(path: Optional[str]) -> bool:
+    """stat 한 번으로 존재 여부와 크기를 함께 확인 (빈 파일은 병합 대상에서 제외)"""
+    if not path:
+        return False
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
+def _ensure_parent_dir(path: str):
+    """출력 파일의 상위 폴더 생성 (경로에 폴더가 없으면 생략)"""
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
 
 class FFmpegRenderer:
     """
@@ -14,8 +62,50 @@ class FFmpegRenderer:
     
     def __init__(self):
         self.video_generator = VideoGenerator()
+        # 실행 파일 경로는 VideoGenerator에서 찾아둔 값을 공유
+        self._ffmpeg = self.video_generator._ffmpeg
+        self._ffprobe = self.video_generator._ffprobe
+        # ffprobe 결과 캐시: (종류, 절대경로, mtime_ns, 크기) -> 결과 (파일이 바뀌면 키가 달라짐)
+        self._probe_cache: Dict[tuple, object] = {}
         print("✅ 새로운 VideoGenerator 기반 FFmpeg 렌더러 초기화 완료")
     
+    def _remux_single_video(self, src: str, dst: str) -> bool:
+        """
+        입력이 하나뿐인 병합: 재인코딩 없이 스트림 복사로 새 파일을 만들고 faststart 적용
+        (하드링크는 중간 세그먼트와 inode를 공유해 세그먼트 재렌더링 시 최종본까지 바뀌므로 사용하지 않음)
+        재다중화 성공 여부를 반환합니다. (실패 시 대체 처리는 호출하는 쪽에서 수행)
+        """
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return True
+
+        command = [
+            self._ffmpeg, '-y',
+            '-i', src,
+            '-c', 'copy',
+            *mp4_output_args(),
+            dst
+        ]
+        log_ffmpeg_command("🚀 [FFmpeg] 단일 비디오 재다중화 실행", command)
+
+        try:
+            result = run_ffmpeg_job(command, timeout=300)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️ 단일 비디오 재다중화 실행 오류: {e}")
+            return False
+        if result.returncode != 0:
+            print(f"⚠️ 단일 비디오 재다중화 실패 (Return code: {result.returncode})")
+            print(f"Error output: {result.stderr}")
+            return False
+        return True
+
+    def _write_single_video(self, src: str, dst: str):
+        """단일 입력을 출력 경로에 기록: 재다중화를 먼저 시도하고, 실패하면 원본 파일을 그대로 복사"""
+        if self._remux_single_video(src, dst):
+            print(f"✅ 병합할 비디오가 하나뿐이라 스트림 복사로 출력했습니다: {dst}")
+        else:
+            shutil.copyfile(src, dst)
+            print(f"⚠️ 재다중화에 실패해 원본 비디오를 그대로 복사했습니다 (faststart 미적용): {dst}")
+
     def create_video_from_timing(self, timing_path: str, output_path: str, image_dir: str, script_type: str = None) -> bool:
         """
         타이밍 JSON 파일을 직접 사용하여 비디오 생성
@@ -37,7 +127,6 @@ class FFmpegRenderer:
             
         except Exception as e:
             print(f"🔥🔥🔥 [오류] 타이밍 기반 비디오 생성 중 오류: {e}")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -51,27 +140,23 @@ class FFmpegRenderer:
         print("🔗 최종 병합 비디오 생성 시작 (스무스 전환 포함)")
         
         try:
-            # 존재하는 비디오 파일들만 수집
+            # 존재하는(비어 있지 않은) 비디오 파일들만 수집
             existing_videos = []
-            
-            if intro_path and os.path.exists(intro_path):
-                existing_videos.append(intro_path)
-                print(f"✅ 인트로 비디오 포함: {intro_path}")
-            
-            if conversation_path and os.path.exists(conversation_path):
-                existing_videos.append(conversation_path)
-                print(f"✅ 회화 비디오 포함: {conversation_path}")
-            
-            if ending_path and os.path.exists(ending_path):
-                existing_videos.append(ending_path)
-                print(f"✅ 엔딩 비디오 포함: {ending_path}")
+            for label, video_path in (("인트로", intro_path), ("회화", conversation_path), ("엔딩", ending_path)):
+                if _is_nonempty_file(video_path):
+                    existing_videos.append(video_path)
+                    print(f"✅ {label} 비디오 포함: {video_path}")
             
             if not existing_videos:
                 print("🔥🔥🔥 [오류] 병합할 비디오 파일이 없습니다.")
                 return False
             
             # 출력 디렉토리 생성
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            _ensure_parent_dir(output_path)
+
+            if len(existing_videos) == 1:
+                self._write_single_video(existing_videos[0], output_path)
+                return True
             
             # 스무스 전환 여부에 따라 다른 방식 사용
             # 사용자 요청에 따라 항상 단순 병합을 사용하도록 수정
@@ -79,7 +164,6 @@ class FFmpegRenderer:
                 
         except Exception as e:
             print(f"🔥🔥🔥 [오류] 최종 병합 중 예상치 못한 오류: {e}")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -87,14 +171,14 @@ class FFmpegRenderer:
         """
         스무스 전환 효과가 포함된 비디오 병합 (오디오 기반 전환)
         """
-        import subprocess
-        
         print("🎬 스무스 전환 효과로 비디오 병합 중...")
         
-        # 각 비디오의 오디오 길이 측정
+        # 각 비디오의 오디오 길이 측정 (ffprobe 프로세스들을 동시에 실행, 결과는 입력 순서 유지)
+        with ThreadPoolExecutor(max_workers=min(8, len(video_paths)) or 1) as executor:
+            probed_durations = list(executor.map(self._get_audio_duration, video_paths))
+
         audio_durations = []
-        for video_path in video_paths:
-            duration = self._get_audio_duration(video_path)
+        for video_path, duration in zip(video_paths, probed_durations):
             if duration is None:
                 print(f"⚠️ 오디오 길이 측정 실패, 기본 concat 사용: {video_path}")
                 return self._create_simple_merged_video(video_paths, output_path)
@@ -102,25 +186,23 @@ class FFmpegRenderer:
             print(f"📊 {os.path.basename(video_path)}: {duration:.2f}초")
         
         # 입력 파일들
-        input_args = []
-        for video_path in video_paths:
-            input_args.extend(['-i', video_path])
+        input_args = list(chain.from_iterable(('-i', video_path) for video_path in video_paths))
         
         # 오디오 겹치지 않는 스무스 전환 필터 생성 (패딩 고려)
         if len(video_paths) == 2:
             # 2개 비디오: 첫 번째 오디오 끝에서 비디오만 전환
             # 패딩이 추가된 비디오이므로 원본 오디오 길이 + 1초 패딩에서 1초 전에 전환
             offset1 = max(0, audio_durations[0] - 1.0)  # 1초 전에 전환 시작
-            filter_complex = f"[0:v]trim=start=0.001,setpts=PTS-STARTPTS[v0];[1:v]setpts=PTS-STARTPTS[v1];[v0][v1]xfade=transition=dissolve:duration=1.0:offset={offset1}[v];[0:a][1:a]concat=n=2:v=0:a=1[a]"
-            map_args = ['-map', '[v]', '-map', '[a]']
+            video_filter = _XFADE_2_TEMPLATE.format(offset1=offset1)
+            audio_filter = _AUDIO_CONCAT_2
         elif len(video_paths) == 3:
             # 3개 비디오: 각 오디오 끝에서 비디오만 전환, 오디오는 순차 재생
             # 패딩이 추가된 비디오이므로 원본 오디오 길이 + 1초 패딩에서 1초 전에 전환
             offset1 = max(0, audio_durations[0] - 1.0)  # 인트로→회화 전환 시점
             offset2 = max(0, audio_durations[0] + audio_durations[1] - 1.0)  # 회화→엔딩 전환 시점
             
-            filter_complex = f"[0:v]trim=start=0.001,setpts=PTS-STARTPTS[v0];[1:v]setpts=PTS-STARTPTS[v1];[2:v]setpts=PTS-STARTPTS[v2];[v0][v1]xfade=transition=dissolve:duration=1.0:offset={offset1}[v01];[v01][v2]xfade=transition=dissolve:duration=1.0:offset={offset2}[v];[0:a][1:a][2:a]concat=n=3:v=0:a=1[a]"
-            map_args = ['-map', '[v]', '-map', '[a]']
+            video_filter = _XFADE_3_TEMPLATE.format(offset1=offset1, offset2=offset2)
+            audio_filter = _AUDIO_CONCAT_3
             
             print(f"🎯 전환 시점: 인트로→회화 {offset1:.2f}초, 회화→엔딩 {offset2:.2f}초")
             print(f"🎵 오디오: 겹치지 않고 순차 재생 (인트로 {audio_durations[0]:.2f}초 → 회화 {audio_durations[1]:.2f}초 → 엔딩 {audio_durations[2]:.2f}초)")
@@ -128,23 +210,45 @@ class FFmpegRenderer:
         else:
             # 3개 이상: 기본 concat 사용
             return self._create_simple_merged_video(video_paths, output_path)
+
+        # 오디오 형식이 모두 같으면 concat 필터(디코딩+AAC 재인코딩) 대신
+        # concat demuxer로 이어 붙여 스트림 복사 (목록은 stdin으로 전달, 비디오 전환 그래프는 그대로)
+        concat_text = None
+        if self._audio_streams_match(video_paths):
+            print("⚡ 오디오 형식이 모두 동일하여 오디오는 재인코딩 없이 스트림 복사합니다.")
+            concat_text = _build_concat_list(video_paths)
+            input_args.extend(['-f', 'concat', '-safe', '0', '-protocol_whitelist', 'pipe,file', '-i', 'pipe:0'])
+            filter_complex = video_filter
+            map_args = ['-map', '[v]', '-map', f'{len(video_paths)}:a']
+            audio_codec_args = ['-c:a', 'copy']
+        else:
+            filter_complex = f"{video_filter};{audio_filter}"
+            map_args = ['-map', '[v]', '-map', '[a]']
+            audio_codec_args = [
+                '-c:a', 'aac',
+                '-ar', '44100',            # 오디오 샘플링 레이트
+                '-ac', '2',                # 스테레오 오디오
+            ]
         
+        # 하드웨어 인코더가 있으면 사용 (xfade 필터는 CPU에서 처리되므로 디코딩은 소프트웨어 유지)
+        encoder = self.video_generator.h264_encoder
+        if encoder == 'libx264':
+            video_codec_args = ['-c:v', 'libx264', '-preset', 'fast', '-crf', '28']  # 더 빠른 인코딩, 더 작은 파일 크기
+        else:
+            video_codec_args = h264_encoder_args(encoder, '8000k')
+
         # FFmpeg 명령어
         cmd = [
-            'ffmpeg', '-y',
+            self._ffmpeg, '-y',
             *input_args,
             '-filter_complex', filter_complex,
             *map_args,
-            '-c:v', 'libx264',
+            *video_codec_args,
             '-profile:v', 'baseline',  # QuickTime Player 호환성
             '-level', '3.1',           # QuickTime Player 호환성
             '-pix_fmt', 'yuv420p',     # QuickTime Player 호환성
-            '-c:a', 'aac',
-            '-ar', '44100',            # 오디오 샘플링 레이트
-            '-ac', '2',                # 스테레오 오디오
-            '-preset', 'fast',         # 더 빠른 인코딩
-            '-crf', '28',              # 더 작은 파일 크기
-            '-movflags', '+faststart', # 스트리밍 최적화
+            *audio_codec_args,
+            *mp4_output_args(),        # 스트리밍 최적화 (병렬 렌더링 중에는 스레드 수 고정)
             '-f', 'mp4',               # 명시적 MP4 포맷
             '-avoid_negative_ts', 'make_zero',  # 타임스탬프 정규화
             '-fflags', '+genpts',      # 타임스탬프 생성
@@ -152,11 +256,10 @@ class FFmpegRenderer:
             output_path
         ]
         
-        print(f"🚀 [FFmpeg] 스무스 전환 명령어:")
-        print(f"{' '.join(cmd)}")
+        log_ffmpeg_command("🚀 [FFmpeg] 스무스 전환 실행", cmd)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = run_ffmpeg_job(cmd, input=concat_text, timeout=300)
             if result.returncode == 0:
                 print(f"✅ 스무스 전환 비디오 병합 완료: {output_path}")
                 return True
@@ -172,63 +275,111 @@ class FFmpegRenderer:
             print(f"🔥🔥🔥 [오류] FFmpeg 실행 중 예외 발생: {e}")
             return False
     
-    def _get_audio_duration(self, video_path: str) -> Optional[float]:
+    def _probe_cache_key(self, kind: str, path: str) -> tuple:
+        st = os.stat(path)
+        return (kind, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def _probe_media(self, video_path: str) -> Optional[dict]:
         """
-        비디오 파일의 오디오 길이를 측정
+        ffprobe 한 번으로 길이(format=duration)와 스트림 정보를 함께 읽어 캐시합니다.
+        ffprobe는 입력을 하나만 받으므로, 파일당 프로세스 하나로 두 정보를 모두 얻습니다.
         """
-        import subprocess
-        
         try:
+            cache_key = self._probe_cache_key('media', video_path)
+            if cache_key in self._probe_cache:
+                return self._probe_cache[cache_key]
+
             cmd = [
-                'ffprobe', '-v', 'quiet', '-show_entries', 'format=duration',
-                '-of', 'csv=p=0', video_path
+                self._ffprobe, '-v', 'error',
+                '-show_entries', 'format=duration:stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,time_base,sample_rate,channels',
+                '-of', 'json', video_path
             ]
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            if result.returncode == 0:
-                duration = float(result.stdout.strip())
-                return duration
-            else:
+            if result.returncode != 0:
                 print(f"⚠️ ffprobe 오류: {result.stderr}")
                 return None
+            info = json.loads(result.stdout)
+            self._probe_cache[cache_key] = info
+            return info
         except Exception as e:
-            print(f"⚠️ 오디오 길이 측정 실패: {e}")
+            print(f"⚠️ 미디어 정보 측정 실패: {e}")
+            return None
+
+    def _get_audio_duration(self, video_path: str) -> Optional[float]:
+        """
+        비디오 파일의 오디오 길이를 측정
+        """
+        info = self._probe_media(video_path)
+        try:
+            return float(info['format']['duration'])
+        except (TypeError, KeyError, ValueError):
             return None
     
+    def _probe_stream_signature(self, video_path: str) -> Optional[tuple]:
+        """
+        concat 스트림 복사 가능 여부 판단용 스트림 정보 (코덱, 해상도, 픽셀 포맷, 프레임레이트, 타임베이스, 오디오 형식)
+        """
+        info = self._probe_media(video_path)
+        if not info:
+            return None
+        streams = info.get('streams', [])
+        return tuple(sorted(tuple(sorted(stream.items())) for stream in streams)) or None
+
+    def _audio_signature(self, video_path: str) -> Optional[tuple]:
+        """오디오 스트림 정보 (코덱, 샘플레이트, 채널)만 추린 시그니처"""
+        info = self._probe_media(video_path)
+        if not info:
+            return None
+        audio_streams = [tuple(sorted(stream.items())) for stream in info.get('streams', []) if stream.get('codec_type') == 'audio']
+        return tuple(audio_streams) or None
+
+    def _audio_streams_match(self, video_paths: list) -> bool:
+        """모든 입력 비디오의 오디오 형식이 동일한지 확인합니다. (판단할 수 없으면 False)"""
+        with ThreadPoolExecutor(max_workers=min(8, len(video_paths)) or 1) as executor:
+            signatures = list(executor.map(self._audio_signature, video_paths))
+        return bool(signatures) and None not in signatures and len(set(signatures)) == 1
+
+    def _streams_match(self, video_paths: list) -> bool:
+        """모든 입력 비디오의 스트림 형식이 동일한지 확인합니다. (판단할 수 없으면 False)"""
+        with ThreadPoolExecutor(max_workers=min(8, len(video_paths)) or 1) as executor:
+            signatures = list(executor.map(self._probe_stream_signature, video_paths))
+        return bool(signatures) and None not in signatures and len(set(signatures)) == 1
+
     def _create_simple_merged_video(self, video_paths: list, output_path: str) -> bool:
         """
         기본 concat 프로토콜 방식으로 비디오를 병합합니다. (빠르고 안정적, 전환 효과 없음)
         """
-        import subprocess
-        
         print("🔗 기본 concat 프로토콜 방식으로 비디오 병합 중...")
 
-        # 임시 concat 리스트 파일 생성
-        concat_list_path = output_path + "_concat_list.txt"
         try:
-            with open(concat_list_path, 'w', encoding='utf-8') as f:
-                for video_path in video_paths:
-                    # 절대 경로를 사용하여 FFmpeg가 파일을 정확히 찾도록 수정
-                    absolute_path = os.path.abspath(video_path)
-                    safe_path = absolute_path.replace("'", "'\\''")
-                    f.write(f"file '{safe_path}'\n")
+            # concat 리스트는 임시 파일 대신 stdin(pipe:0)으로 전달
+            concat_text = _build_concat_list(video_paths)
+
+            # 모든 입력의 코덱/해상도/프레임레이트/오디오 형식이 같으면 재인코딩 없이 스트림 복사
+            if self._streams_match(video_paths):
+                print("⚡ 입력 비디오 형식이 모두 동일하여 스트림 복사(-c copy)로 병합합니다.")
+                codec_args = ['-c', 'copy']
+            else:
+                codec_args = [
+                    # 최종 병합이므로 품질을 위해 비트레이트를 약간 높게 설정
+                    *h264_encoder_args(self.video_generator.h264_encoder, '10000k'),
+                    *SEGMENT_FORMAT_ARGS,
+                ]
 
             command = [
-                'ffmpeg', '-y',
+                self._ffmpeg, '-y',
                 '-f', 'concat',
                 '-safe', '0',
-                '-i', concat_list_path,
-                '-c:v', 'h264_videotoolbox',
-                '-b:v', '10000k', # 최종 병합이므로 품질을 위해 비트레이트를 약간 높게 설정
-                '-r', '25',
-                '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac', '-ar', '44100', '-ac', '2',
+                '-protocol_whitelist', 'pipe,file',
+                '-i', 'pipe:0',
+                *codec_args,
+                *mp4_output_args(),
                 output_path
             ]
             
-            print("🚀 [FFmpeg] 기본 병합 (프로토콜) 명령어:")
-            print(" ".join(command))
+            log_ffmpeg_command("🚀 [FFmpeg] 기본 병합 (프로토콜) 실행", command)
 
-            result = subprocess.run(command, capture_output=True, text=True, timeout=300)
+            result = run_ffmpeg_job(command, input=concat_text, timeout=300)
             if result.returncode == 0:
                 print(f"✅ 기본 병합 비디오 생성 완료: {output_path}")
                 return True
@@ -240,12 +391,8 @@ class FFmpegRenderer:
 
         except Exception as e:
             print(f"🔥🔥🔥 [오류] 최종 병합 중 예상치 못한 오류: {e}")
-            import traceback
             traceback.print_exc()
             return False
-        finally:
-            if os.path.exists(concat_list_path):
-                os.remove(concat_list_path)
     
     def render_scene_video(self, audio_path: str, subtitle_frames: List[Dict], 
                           output_path: str, resolution: str, default_background: str):
@@ -273,7 +420,6 @@ class FFmpegRenderer:
             
         except Exception as e:
             print(f"🔥🔥🔥 [오류] 장면 비디오 렌더링 중 오류: {e}")
-            import traceback
             traceback.print_exc()
             return False
     
@@ -285,51 +431,24 @@ class FFmpegRenderer:
         
         try:
             # 존재하는 비디오 파일들만 수집
-            existing_videos = [path for path in video_paths if os.path.exists(path)]
+            existing_videos = [path for path in video_paths if _is_nonempty_file(path)]
             
             if not existing_videos:
                 print("🔥🔥🔥 [오류] 병합할 비디오 파일이 없습니다.")
                 return False
             
             # 출력 디렉토리 생성
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # FFmpeg concat 명령어 생성
-            concat_list_path = output_path.replace('.mp4', '_concat_list.txt')
-            
-            with open(concat_list_path, 'w', encoding='utf-8') as f:
-                for video_path in existing_videos:
-                    f.write(f"file '{os.path.abspath(video_path)}'\n")
-            
-            # FFmpeg 실행
-            import subprocess
-            command = [
-                'ffmpeg', '-y',
-                '-f', 'concat',
-                '-safe', '0',
-                '-i', concat_list_path,
-                '-c', 'copy',
-                output_path
-            ]
-            
-            print("🚀 [FFmpeg] 병합 명령어:")
-            print(" ".join(command))
-            
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            _ensure_parent_dir(output_path)
+
+            if len(existing_videos) == 1:
+                self._write_single_video(existing_videos[0], output_path)
+                return True
             
-            # 임시 파일 정리
-            if os.path.exists(concat_list_path):
-                os.remove(concat_list_path)            
-            print(f"✅ 비디오 병합 완료: {output_path}")
-            return True
+            # 입력 형식이 모두 같으면 스트림 복사, 다르면(예: 25fps/30fps 혼합) 재인코딩 병합
+            # (형식이 다른 입력을 -c copy로 이어 붙이면 오류 없이 깨진 결과물이 나옴)
+            return self._create_simple_merged_video(existing_videos, output_path)
             
-        except subprocess.CalledProcessError as e:
-            print("🔥🔥🔥 [오류] FFmpeg 병합 실행 중 오류 발생!")
-            print(f"Return code: {e.returncode}")
-            print(f"Error output: {e.stderr}")
-            return False
         except Exception as e:
             print(f"🔥🔥🔥 [오류] 비디오 병합 중 예상치 못한 오류: {e}")
-            import traceback
             traceback.print_exc()
             return False
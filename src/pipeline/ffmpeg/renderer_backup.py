@@ -1,45 +1,145 @@
 import os
-import subprocess
-import tempfile
+import functools
+import shutil
 import json
-from typing import List, Dict, Optional
-import ffmpeg
+import glob
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ..video.generator import FFMPEG_MAX_JOBS, detect_h264_encoder, ffmpeg_threads_per_job, h264_encoder_args, mp4_output_args, run_ffmpeg_job
+
+# 스크립트 타입 -> 타이밍 파일명에 쓰는 영문 타입
+_SCRIPT_TYPE_EN: Dict[str, str] = {
+    "intro": "intro",
+    "ending": "ending",
+    "conversation": "conversation",
+}
+
+
+def _abs_paths(paths: List[str]) -> List[str]:
+    """경로 목록을 절대 경로로 변환 (getcwd는 목록당 한 번만 호출)"""
+    cwd = os.getcwd()
+    return [p if os.path.isabs(p) else os.path.normpath(os.path.join(cwd, p)) for p in paths]
+
+
+def _build_concat_list(paths: List[str], durations: Optional[List[float]] = None) -> str:
+    """
+    ffmpeg concat demuxer용 목록 텍스트를 한 번에 생성합니다.
+    durations가 있으면 각 파일 뒤에 duration을 쓰고, 마지막 이미지는 길이 없이 한 번 더 적습니다.
+    """
+    abs_paths = _abs_paths(paths)
+    if durations is None:
+        return "".join(f"file '{p}'\n" for p in abs_paths)
+    lines = [f"file '{p}'\nduration {d}\n" for p, d in zip(abs_paths, durations)]
+    if abs_paths:
+        lines.append(f"file '{abs_paths[-1]}'\n")
+    return "".join(lines)
+
+
+def _concat_input_args(frame_rate: Optional[str] = None) -> List[str]:
+    """
+    stdin(pipe:0)으로 concat 목록을 받는 ffmpeg 입력 인자
+    임시 파일을 만들지 않으므로 동시에 여러 렌더링이 실행되어도 충돌하지 않습니다.
+    목록 텍스트는 run_ffmpeg_job(..., input=...)으로 전달합니다.
+    """
+    rate_args = ['-r', frame_rate] if frame_rate else []
+    return ['-f', 'concat', '-safe', '0', '-protocol_whitelist', 'pipe,file', *rate_args, '-i', 'pipe:0']
+
+
+@functools.lru_cache(maxsize=128)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Dict:
+    """
+    JSON 파일 파싱 결과 캐시 (수정 시각/크기가 키에 포함되어 파일이 바뀌면 다시 읽음)
+    반환된 dict는 여러 호출이 공유하므로 읽기 전용으로 사용합니다.
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_json_if_exists(path: str) -> Optional[Dict]:
+    """파일이 있으면 (stat 한 번으로 확인) 캐시된 파싱 결과를, 없으면 None을 반환"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _read_json_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def _scan_conversation_images(subtitle_dir: str) -> Tuple[List[str], List[str]]:
+    """
+    회화 자막 이미지(kor-chn_*_screen1.png / kor-chn_*_screen2.png)를 디렉터리 한 번 순회로 분류
+    (패턴별 glob을 두 번 돌리는 것보다 디렉터리 읽기/패턴 매칭이 절반)
+    """
+    screen1_files, screen2_files = [], []
+    try:
+        with os.scandir(subtitle_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not name.startswith('kor-chn_'):
+                    continue
+                if name.endswith('_screen1.png'):
+                    screen1_files.append(entry.path)
+                elif name.endswith('_screen2.png'):
+                    screen2_files.append(entry.path)
+    except OSError:
+        pass  # 디렉터리가 없으면 glob과 마찬가지로 빈 목록
+    screen1_files.sort()
+    screen2_files.sort()
+    return screen1_files, screen2_files
+
+
+@functools.lru_cache(maxsize=1)
+def _find_ffmpeg() -> Optional[str]:
+    """PATH에서 ffmpeg 실행 파일 위치를 찾습니다. (프로세스당 한 번, 서브프로세스 실행 없음)"""
+    return shutil.which('ffmpeg')
+
 
 class FFmpegRenderer:
     def __init__(self):
         self._check_ffmpeg_availability()
+        # 1프레임 시험 인코딩으로 검증된 하드웨어 H.264 인코더 (없으면 libx264, 프로세스당 한 번만 검사)
+        self.h264_encoder = detect_h264_encoder(_find_ffmpeg())
+
+    def _video_codec_args(self) -> List[str]:
+        """
+        비디오 인코더 인자 (하드웨어 인코더는 CRF가 없어 비트레이트 지정)
+        입력이 정지 자막 이미지뿐이므로 libx264는 stillimage 튜닝으로 같은 프레임 반복 구간의 연산을 줄임
+        """
+        if self.h264_encoder == 'libx264':
+            return ['-c:v', 'libx264', '-tune', 'stillimage']
+        return h264_encoder_args(self.h264_encoder, '8000k')
 
     def _check_ffmpeg_availability(self):
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        except FileNotFoundError:
+        if _find_ffmpeg() is None:
             raise FileNotFoundError("FFmpeg is not installed or not in the system's PATH.")
     
     def _load_timing_data(self, project_name: str, identifier: str, video_type: str) -> Optional[Dict]:
         """깔끔한 타이밍 데이터 로드"""
         try:
             # 스크립트 타입을 영문으로 변환
-            script_type_mapping = {
-                "intro": "intro",
-                "ending": "ending", 
-                "conversation": "conversation"
-            }
-            english_script_type = script_type_mapping.get(video_type, video_type)
+            english_script_type = _SCRIPT_TYPE_EN.get(video_type, video_type)
             
             # 깔끔한 타이밍 파일 경로 우선 시도
             clean_timing_path = os.path.join("output", project_name, identifier, "timing", f"{identifier}_{english_script_type}_clean.json")
             legacy_timing_path = os.path.join("output", project_name, identifier, f"{identifier}_{english_script_type}.json")
             
             # 깔끔한 타이밍 파일이 있으면 사용
-            if os.path.exists(clean_timing_path):
-                with open(clean_timing_path, 'r', encoding='utf-8') as f:
-                    timing_data = json.load(f)
+            timing_data = _load_json_if_exists(clean_timing_path)
+            if timing_data is not None:
                 print(f"✅ 깔끔한 타이밍 데이터 로드: {clean_timing_path}")
                 return timing_data
             # 기존 타이밍 파일이 있으면 사용
-            elif os.path.exists(legacy_timing_path):
-                with open(legacy_timing_path, 'r', encoding='utf-8') as f:
-                    timing_data = json.load(f)
+            timing_data = _load_json_if_exists(legacy_timing_path)
+            if timing_data is not None:
                 print(f"✅ 기존 타이밍 데이터 로드: {legacy_timing_path}")
                 return timing_data
             else:
@@ -57,43 +157,27 @@ class FFmpegRenderer:
             print("Warning: Total duration is zero. Cannot render video.")
             return
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as concat_file:
-            for frame in subtitle_frames:
-                concat_file.write(f"file '{os.path.abspath(frame['output_path'])}'\n")
-                concat_file.write(f"duration {frame['duration']}\n")
-            # The last image needs to be specified again without duration
-            if subtitle_frames:
-                concat_file.write(f"file '{os.path.abspath(subtitle_frames[-1]['output_path'])}'\n")
-            concat_list_path = concat_file.name
-
-        try:
-            background_input = ffmpeg.input(default_background, loop=1, t=total_duration).filter('scale', width, height)
-            image_input = ffmpeg.input(concat_list_path, f='concat', safe=0, r='30')
-            audio_input = ffmpeg.input(audio_path)
-
-            video_stream = ffmpeg.overlay(background_input, image_input, x='(W-w)/2', y='(H-h)/2')
+        concat_text = _build_concat_list([f['output_path'] for f in subtitle_frames],
+                                         [f['duration'] for f in subtitle_frames])
 
-            (ffmpeg
-                .output(video_stream, audio_input, output_path, vcodec='libx264', acodec='aac', pix_fmt='yuv420p', shortest=None)
-                .run(overwrite_output=True, quiet=True))
-        finally:
-            if os.path.exists(concat_list_path):
-                os.remove(concat_list_path)
+        # 입력: 0 = 배경(반복), 1 = 자막 이미지 concat(stdin), 2 = 오디오
+        command = [
+            _find_ffmpeg(), '-y', '-hide_banner',
+            '-loop', '1', '-t', str(total_duration), '-i', default_background,
+            *_concat_input_args('30'),
+            '-i', audio_path,
+            '-filter_complex', f"[0:v]scale={width}:{height}[bg];[bg][1:v]overlay=x=(W-w)/2:y=(H-h)/2[v]",
+            '-map', '[v]', '-map', '2:a',
+            *self._video_codec_args(),
+            '-c:a', 'aac', '-pix_fmt', 'yuv420p', '-shortest',
+            *mp4_output_args(),
+            output_path
+        ]
+        run_ffmpeg_job(command, input=concat_text, check=True)
 
     def merge_videos(self, video_paths: List[str], output_path: str):
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as concat_file:
-            for path in video_paths:
-                concat_file.write(f"file '{os.path.abspath(path)}'\n")
-            concat_list_path = concat_file.name
-        
-        try:
-            (ffmpeg
-                .input(concat_list_path, f='concat', safe=0)
-                .output(output_path, c='copy')
-                .run(overwrite_output=True, quiet=True))
-        finally:
-            if os.path.exists(concat_list_path):
-                os.remove(concat_list_path)
+        command = [_find_ffmpeg(), '-y', '-hide_banner', *_concat_input_args(), '-c', 'copy', output_path]
+        run_ffmpeg_job(command, input=_build_concat_list(video_paths), check=True)
 
     def create_conversation_video(self, conversation_data: List[Dict], audio_path: str, 
                                  subtitle_dir: str, output_path: str, resolution: str, 
@@ -105,12 +189,7 @@ class FFmpegRenderer:
             width, height = map(int, resolution.split('x'))
             
             # 1. 실제 생성된 회화 이미지 파일들 찾기
-            import glob
-            screen1_pattern = os.path.join(subtitle_dir, "kor-chn_*_screen1.png")
-            screen2_pattern = os.path.join(subtitle_dir, "kor-chn_*_screen2.png")
-            
-            screen1_files = sorted(glob.glob(screen1_pattern))
-            screen2_files = sorted(glob.glob(screen2_pattern))
+            screen1_files, screen2_files = _scan_conversation_images(subtitle_dir)
             
             if not screen1_files and not screen2_files:
                 print(f"❌ 회화 이미지 파일을 찾을 수 없습니다: {subtitle_dir}")
@@ -191,15 +270,7 @@ class FFmpegRenderer:
                 return False
             
             # 3. concat 리스트 생성
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as concat_file:
-                for segment in video_segments:
-                    if os.path.exists(segment['image_path']):
-                        concat_file.write(f"file '{os.path.abspath(segment['image_path'])}'\n")
-                        concat_file.write(f"duration {segment['duration']}\n")
-                # 마지막 이미지 다시 추가 (duration 없이)
-                if video_segments:
-                    concat_file.write(f"file '{os.path.abspath(video_segments[-1]['image_path'])}'\n")
-                concat_list_path = concat_file.name
+            existing_segments = [s for s in video_segments if os.path.exists(s['image_path'])]
             
             # 4. 오디오 파일 확인
             has_audio = audio_path and os.path.exists(audio_path)
@@ -209,15 +280,7 @@ class FFmpegRenderer:
             
             # 5. 비디오 렌더링 (자막 이미지만 사용, 배경 이미지 불필요)
             print(f"🎬 자막 이미지만 사용하여 비디오 생성 (배경 이미지 불필요)")
-            image_input = ffmpeg.input(concat_list_path, f='concat', safe=0, r='30')
-            audio_input = ffmpeg.input(audio_path)
-            
-            # 자막 이미지에 해상도 적용
-            video_stream = image_input.filter('scale', width, height)
-            
-            (ffmpeg
-                .output(video_stream, audio_input, output_path, vcodec='libx264', acodec='aac', pix_fmt='yuv420p', shortest=None)
-                .run(overwrite_output=True, quiet=True))
+            self._render_segments(existing_segments, audio_path, output_path, width, height)
             
             print(f"✅ 회화 비디오 생성 완료: {output_path}")
             return True
@@ -231,12 +294,8 @@ class FFmpegRenderer:
             print(f"  - output_path: {output_path}")
             print(f"  - resolution: {resolution}")
             print(f"  - background_path: {background_path}")
-            import traceback
             traceback.print_exc()
             return False
-        finally:
-            if 'concat_list_path' in locals() and os.path.exists(concat_list_path):
-                os.remove(concat_list_path)
 
     def create_intro_ending_video(self, sentences: List[str], audio_path: str, 
                                  subtitle_dir: str, output_path: str, resolution: str,
@@ -252,7 +311,6 @@ class FFmpegRenderer:
             current_time = 0.0
             
             # 실제 파일명 패턴으로 이미지 찾기
-            import glob
             image_pattern = os.path.join(subtitle_dir, f"kor-chn_{video_type}_*.png")
             image_files = sorted(glob.glob(image_pattern))
             
@@ -291,49 +349,74 @@ class FFmpegRenderer:
                 print(f"❌ {video_type} 비디오 세그먼트가 없습니다.")
                 return False
             
-            # 2. concat 리스트 생성
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as concat_file:
-                for segment in video_segments:
-                    concat_file.write(f"file '{os.path.abspath(segment['image_path'])}'\n")
-                    concat_file.write(f"duration {segment['duration']}\n")
-                # 마지막 이미지 다시 추가 (duration 없이)
-                if video_segments:
-                    concat_file.write(f"file '{os.path.abspath(video_segments[-1]['image_path'])}'\n")
-                concat_list_path = concat_file.name
-            
-            # 3. 오디오 파일 확인 (선택적)
+            # 2. 오디오 파일 확인 (선택적)
             has_audio = audio_path and os.path.exists(audio_path)
             if not has_audio:
                 print(f"⚠️ 오디오 파일이 없습니다: {audio_path}")
             
-            # 4. 비디오 렌더링 (자막 이미지만 사용, 배경 이미지 불필요)
+            # 3. 비디오 렌더링 (자막 이미지만 사용, 배경 이미지 불필요)
             print(f"🎬 자막 이미지만 사용하여 {video_type} 비디오 생성 (배경 이미지 불필요)")
-            image_input = ffmpeg.input(concat_list_path, f='concat', safe=0, r='30')
-            
-            # 자막 이미지에 해상도 적용
-            video_stream = image_input.filter('scale', width, height)
-            
-            if has_audio:
-                audio_input = ffmpeg.input(audio_path)
-                (ffmpeg
-                    .output(video_stream, audio_input, output_path, vcodec='libx264', acodec='aac', pix_fmt='yuv420p', shortest=None)
-                    .run(overwrite_output=True, quiet=True))
-            else:
-                (ffmpeg
-                    .output(video_stream, output_path, vcodec='libx264', pix_fmt='yuv420p')
-                    .run(overwrite_output=True, quiet=True))
+            self._render_segments(video_segments, audio_path if has_audio else None, output_path, width, height)
             
             print(f"✅ {video_type} 비디오 생성 완료: {output_path}")
             return True
             
         except Exception as e:
             print(f"❌ {video_type} 비디오 생성 실패: {e}")
-            import traceback
             traceback.print_exc()
             return False
+
+    def _render_segments(self, video_segments: List[Dict], audio_path: Optional[str],
+                         output_path: str, width: int, height: int):
+        """
+        이미지 세그먼트 목록을 여러 조각으로 나눠 동시에 인코딩한 뒤,
+        조각들을 재인코딩 없이(-c copy) 이어 붙이면서 오디오를 한 번만 입힙니다.
+        조각마다 새로 인코딩하므로 각 조각은 키프레임으로 시작해 스트림 복사 연결이 정확합니다.
+        """
+        chunk_count = max(1, min(len(video_segments), FFMPEG_MAX_JOBS))
+        chunk_size = -(-len(video_segments) // chunk_count)
+        chunks = [video_segments[i:i + chunk_size] for i in range(0, len(video_segments), chunk_size)]
+
+        output_dir = os.path.dirname(output_path) or '.'
+        stem = os.path.splitext(os.path.basename(output_path))[0]
+        chunk_paths = [os.path.join(output_dir, f".{stem}_chunk{i:03d}.mp4") for i in range(len(chunks))]
+        print(f"⚙️ {len(video_segments)}개 세그먼트를 {len(chunks)}개 조각으로 나눠 동시에 인코딩합니다.")
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                futures = [executor.submit(self._encode_chunk, chunk, chunk_path, width, height, len(chunks))
+                           for chunk, chunk_path in zip(chunks, chunk_paths)]
+                for future in futures:
+                    future.result()  # 조각 인코딩 실패 시 예외를 그대로 전달
+
+            command = [_find_ffmpeg(), '-y', '-hide_banner', *_concat_input_args()]
+            if audio_path:
+                command += ['-i', audio_path, '-map', '0:v', '-map', '1:a', '-c:v', 'copy', '-c:a', 'aac', '-shortest']
+            else:
+                command += ['-map', '0:v', '-c:v', 'copy']
+            command.append(output_path)
+            run_ffmpeg_job(command, input=_build_concat_list(chunk_paths), check=True)
         finally:
-            if 'concat_list_path' in locals() and os.path.exists(concat_list_path):
-                os.remove(concat_list_path)
+            for chunk_path in chunk_paths:
+                if os.path.exists(chunk_path):
+                    os.remove(chunk_path)
+
+    def _encode_chunk(self, segments: List[Dict], output_path: str, width: int, height: int, concurrent_jobs: int = 1):
+        """세그먼트 조각 하나를 무음 비디오로 인코딩 (길이는 조각 세그먼트 길이 합으로 고정, 동시 조각 수만큼 스레드를 나눠 씀)"""
+        concat_text = _build_concat_list([s['image_path'] for s in segments], [s['duration'] for s in segments])
+        chunk_duration = sum(s['duration'] for s in segments)
+        with ffmpeg_threads_per_job(concurrent_jobs):
+            thread_args = mp4_output_args(faststart=False)
+        command = [
+            _find_ffmpeg(), '-y', '-hide_banner',
+            *_concat_input_args('30'),
+            '-vf', f"scale={width}:{height}",
+            *self._video_codec_args(),
+            '-pix_fmt', 'yuv420p', '-r', '30', '-t', str(chunk_duration),
+            *thread_args,
+            output_path
+        ]
+        run_ffmpeg_job(command, input=concat_text, check=True)
 
     def create_final_merged_video(self, intro_path: str, conversation_path: str, 
                                  ending_path: str, output_path: str) -> bool:
@@ -15,7 +15,7 @@ from .models import (
 
 from .parser import ManifestParser
 from .validator import ManifestValidator, ValidationResult, ValidationError
-from .generator import ManifestGenerator
+from .generator import ManifestGenerator, ManifestBatch
 
 __all__ = [
     # Models
@@ -35,7 +35,8 @@ __all__ = [
     'ValidationError',
     
     # Generator
-    'ManifestGenerator'
+    'ManifestGenerator',
+    'ManifestBatch'
 ]
 
 # 버전 정보
@@ -4,14 +4,69 @@ Manifest 파일을 자동으로 생성하고 편집하는 Generator 클래스
 
 import json
 import os
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 from pathlib import Path
-import copy
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .models import Manifest, Scene, DialogueLine
 from .parser import ManifestParser
 
 
+def _append_scene_data(scenes: List[Dict[str, Any]], scene_data: Dict[str, Any]) -> None:
+    """장면 딕셔너리 목록에 새 장면 추가 (ID가 겹치면 _1, _2 ... 접미사로 변경)"""
+    new_id = Scene(**scene_data).id
+    
+    # ID 중복 방지 (set 조회로 후보 ID마다 전체 장면을 훑지 않음)
+    existing_ids = {scene["id"] for scene in scenes}
+    if new_id in existing_ids:
+        counter = 1
+        base_id = new_id
+        while new_id in existing_ids:
+            new_id = f"{base_id}_{counter}"
+            counter += 1
+    
+    # 호출자의 딕셔너리는 이후 편집(update)으로 바뀌지 않도록 복사해서 추가
+    scenes.append({**scene_data, "id": new_id})
+
+
+def _remove_scene_data(scenes: List[Dict[str, Any]], scene_id: str) -> None:
+    """장면 딕셔너리 목록에서 해당 ID의 장면 제거"""
+    scenes[:] = [scene for scene in scenes if scene["id"] != scene_id]
+
+
+def _update_scene_data(scenes: List[Dict[str, Any]], scene_id: str, updates: Dict[str, Any]) -> None:
+    """장면 딕셔너리 목록에서 해당 ID의 장면에 변경 사항 적용"""
+    for scene in scenes:
+        if scene["id"] == scene_id:
+            scene.update(updates)
+            break
+
+
+class ManifestBatch:
+    """ManifestGenerator.batch()에서 사용하는 장면 편집 모음 (파싱/검증은 블록 종료 시 한 번)"""
+    
+    def __init__(self, manifest: Manifest):
+        self.data = manifest.to_dict()
+        self.manifest: Optional[Manifest] = None  # 블록 종료 후 결과 Manifest
+    
+    def add_scene(self, scene_data: Dict[str, Any]) -> None:
+        """장면 추가"""
+        _append_scene_data(self.data["scenes"], scene_data)
+    
+    def remove_scene(self, scene_id: str) -> None:
+        """장면 제거"""
+        _remove_scene_data(self.data["scenes"], scene_id)
+    
+    def update_scene(self, scene_id: str, updates: Dict[str, Any]) -> None:
+        """장면 업데이트"""
+        _update_scene_data(self.data["scenes"], scene_id, updates)
+
+
 class ManifestGenerator:
     """Manifest 파일을 자동으로 생성하고 편집하는 클래스"""
     
@@ -117,7 +172,8 @@ class ManifestGenerator:
             "project_name": project_name,
             "resolution": "1920x1080",
             "default_background": None,
-            "scenes": copy.deepcopy(template["scenes"])
+            # 템플릿 장면은 문자열/리스트만 담고 있고 Pydantic 검증이 새 객체를 만들므로 장면별 얕은 복사로 충분
+            "scenes": [{**scene} for scene in template["scenes"]]
         }
         
         # 사용자 정의 적용
@@ -139,30 +195,16 @@ class ManifestGenerator:
     
     def add_scene(self, manifest: Manifest, scene_data: Dict[str, Any]) -> Manifest:
         """장면 추가"""
-        new_scene = Scene(**scene_data)
-        
-        # ID 중복 방지
-        existing_ids = [scene.id for scene in manifest.scenes]
-        if new_scene.id in existing_ids:
-            counter = 1
-            base_id = new_scene.id
-            while new_scene.id in existing_ids:
-                new_scene.id = f"{base_id}_{counter}"
-                counter += 1
-        
         # 새로운 Manifest 객체 생성 (불변성 유지)
         new_manifest_data = manifest.to_dict()
-        new_manifest_data["scenes"].append(scene_data)
+        _append_scene_data(new_manifest_data["scenes"], scene_data)
         
         return self.parser.parse_dict(new_manifest_data)
     
     def remove_scene(self, manifest: Manifest, scene_id: str) -> Manifest:
         """장면 제거"""
         new_manifest_data = manifest.to_dict()
-        new_manifest_data["scenes"] = [
-            scene for scene in new_manifest_data["scenes"] 
-            if scene["id"] != scene_id
-        ]
+        _remove_scene_data(new_manifest_data["scenes"], scene_id)
         
         return self.parser.parse_dict(new_manifest_data)
     
@@ -170,15 +212,25 @@ class ManifestGenerator:
                     updates: Dict[str, Any]) -> Manifest:
         """장면 업데이트"""
         new_manifest_data = manifest.to_dict()
-        
-        for i, scene in enumerate(new_manifest_data["scenes"]):
-            if scene["id"] == scene_id:
-                # 업데이트 적용
-                scene.update(updates)
-                break
+        _update_scene_data(new_manifest_data["scenes"], scene_id, updates)
         
         return self.parser.parse_dict(new_manifest_data)
     
+    @contextmanager
+    def batch(self, manifest: Manifest) -> Iterator["ManifestBatch"]:
+        """
+        여러 장면 편집을 모아 마지막에 한 번만 파싱/검증
+        (add_scene 등을 반복 호출하면 호출마다 전체 Manifest를 변환·검증함)
+        
+        with generator.batch(manifest) as batch:
+            batch.add_scene({...})
+            batch.remove_scene("intro_01")
+        manifest = batch.manifest
+        """
+        edits = ManifestBatch(manifest)
+        yield edits
+        edits.manifest = self.parser.parse_dict(edits.data)
+    
     def reorder_scenes(self, manifest: Manifest, new_order: List[str]) -> Manifest:
         """장면 순서 변경"""
         # 현재 장면들을 ID로 매핑
@@ -219,8 +271,9 @@ class ManifestGenerator:
         # 새 ID 생성
         if not new_id:
             base_id = original_scene.id
+            existing_ids = {scene.id for scene in manifest.scenes}
             counter = 1
-            while any(scene.id == f"{base_id}_copy_{counter}" for scene in manifest.scenes):
+            while f"{base_id}_copy_{counter}" in existing_ids:
                 counter += 1
             new_id = f"{base_id}_copy_{counter}"
         
@@ -336,5 +389,11 @@ class ManifestGenerator:
             "required": ["project_name", "scenes"]
         }
         
+        if orjson is not None:
+            # orjson은 UTF-8 바이트로 직렬화 (ensure_ascii=False와 같은 출력)
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
+            return
+        
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(schema, f, ensure_ascii=False, indent=2)
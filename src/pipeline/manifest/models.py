@@ -3,21 +3,36 @@ Manifest 파일의 데이터 구조를 정의하는 Pydantic 모델들
 """
 
 from typing import List, Optional, Union, Literal, Dict, Any, Dict, Any
-from pydantic import BaseModel, Field, field_validator
-import re
+from operator import attrgetter
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+# 형식 검증은 Field(pattern=...)로 pydantic-core에 맡김
+# (Python 검증 함수 호출 없이, 패턴 문자열별로 컴파일된 정규식을 재사용)
+_SPEAKER_PATTERN = r'^[A-Za-z0-9_]+$'
+_ID_PATTERN = r'^[a-z0-9_]+$'
+
+# 패턴 위반 시 사용자에게 보여줄 메시지 (pydantic 기본 영문 메시지 대신 사용, parser에서 변환)
+PATTERN_ERROR_MESSAGES = {
+    _SPEAKER_PATTERN: '화자는 영문자, 숫자, 언더스코어만 사용 가능합니다',
+    _ID_PATTERN: 'ID는 소문자, 숫자, 언더스코어만 사용 가능합니다',
+}
+
+# 장면 타입별 필수 필드
+_REQUIRED_BY_TYPE = {
+    'intro': ('text',),
+    'ending': ('text',),
+    'conversation': ('sequence', 'native_script', 'learning_script', 'reading_script'),
+    'dialogue': ('script',),
+}
 
 
 class DialogueLine(BaseModel):
     """대화 라인을 나타내는 모델"""
-    speaker: str = Field(..., description="화자 식별자 (A, B, C 등)")
-    text: str = Field(..., description="대사 내용")
+    model_config = ConfigDict(frozen=True)
     
-    @field_validator('speaker')
-    @classmethod
-    def validate_speaker(cls, v):
-        if not re.match(r'^[A-Za-z0-9_]+$', v):
-            raise ValueError('화자는 영문자, 숫자, 언더스코어만 사용 가능합니다')
-        return v
+    speaker: str = Field(..., pattern=_SPEAKER_PATTERN, description="화자 식별자 (A, B, C 등, 영문자/숫자/언더스코어)")
+    text: str = Field(..., description="대사 내용")
 
 
 class SceneContent(BaseModel):
@@ -31,6 +46,8 @@ class SceneContent(BaseModel):
 
 class ConversationScene(BaseModel):
     """회화 장면을 나타내는 모델"""
+    model_config = ConfigDict(frozen=True)
+    
     sequence: int = Field(..., description="회화 순서 번호")
     native_script: str = Field(..., description="원어 스크립트")
     learning_script: str = Field(..., description="학습어 스크립트")
@@ -39,11 +56,15 @@ class ConversationScene(BaseModel):
 
 class IntroEndingScene(BaseModel):
     """인트로/엔딩 장면을 나타내는 모델"""
+    model_config = ConfigDict(frozen=True)
+    
     full_script: str = Field(..., description="전체 스크립트")
 
 
 class DialogueScene(BaseModel):
     """대화 장면을 나타내는 모델"""
+    model_config = ConfigDict(frozen=True)
+    
     script: List[DialogueLine] = Field(..., description="대화 스크립트 리스트")
     
     @field_validator('script')
@@ -56,7 +77,10 @@ class DialogueScene(BaseModel):
 
 class Scene(BaseModel):
     """개별 장면을 나타내는 모델"""
-    id: str = Field(..., description="장면 고유 식별자")
+    # 생성 후 바꾸지 않음 (변경이 필요하면 model_copy(update=...)로 새 객체 생성)
+    model_config = ConfigDict(frozen=True)
+    
+    id: str = Field(..., pattern=_ID_PATTERN, description="장면 고유 식별자 (소문자/숫자/언더스코어)")
     type: Literal["intro", "conversation", "dialogue", "ending", "thumbnail", "title", "keywords"] = Field(..., description="장면 타입")
     settings: Optional[Dict[str, Any]] = Field(default_factory=dict, description="장면별 UI 설정")
     
@@ -68,38 +92,19 @@ class Scene(BaseModel):
     reading_script: Optional[str] = Field(None, description="읽기 스크립트 (conversation용)")
     script: Optional[List[DialogueLine]] = Field(None, description="대화 스크립트 (dialogue용)")
     
-    @field_validator('*', mode='before')
+    @model_validator(mode='before')
     @classmethod
-    def validate_type_specific_fields(cls, v, info):
-        """타입별 필수 필드 검증"""
-        if not isinstance(v, dict):
-            return v
-            
-        scene_type = v.get('type')
+    def validate_type_specific_fields(cls, data):
+        """타입별 필수 필드 검증 (장면당 한 번, 값 형식/길이 등 상세 검증은 ManifestValidator 담당)"""
+        if not isinstance(data, dict):
+            return data
         
-        if scene_type == "intro" or scene_type == "ending":
-            if not v.get('text'):
-                raise ValueError(f'{scene_type} 타입은 text가 필요합니다')
-                
-        elif scene_type == "conversation":
-            required_fields = ['sequence', 'native_script', 'learning_script', 'reading_script']
-            for field_name in required_fields:
-                if not v.get(field_name):
-                    raise ValueError(f'conversation 타입은 {field_name}가 필요합니다')
-                    
-        elif scene_type == "dialogue":
-            if not v.get('script'):
-                raise ValueError('dialogue 타입은 script가 필요합니다')
-                
-        return v
-    
-    @field_validator('id')
-    @classmethod
-    def validate_id(cls, v):
-        """ID 형식 검증"""
-        if not re.match(r'^[a-z0-9_]+$', v):
-            raise ValueError('ID는 소문자, 숫자, 언더스코어만 사용 가능합니다')
-        return v
+        scene_type = data.get('type')
+        for field_name in _REQUIRED_BY_TYPE.get(scene_type, ()):
+            if data.get(field_name) is None:
+                raise ValueError(f'{scene_type} 타입은 {field_name}가 필요합니다')
+        
+        return data
 
 
 class Manifest(BaseModel):
@@ -114,26 +119,28 @@ class Manifest(BaseModel):
         if not v:
             raise ValueError('최소 하나 이상의 장면이 필요합니다')
         
-        # ID 중복 검사
-        ids = [scene.id for scene in v]
-        if len(ids) != len(set(ids)):
-            raise ValueError('장면 ID는 고유해야 합니다')
-        
-        # conversation 타입의 sequence 중복 검사
-        conversation_sequences = [scene.sequence for scene in v if scene.type == "conversation"]
-        if len(conversation_sequences) != len(set(conversation_sequences)):
-            raise ValueError('conversation 타입의 sequence는 고유해야 합니다')
+        # ID / conversation sequence 중복 검사 (한 번 순회, 첫 중복에서 바로 중단)
+        seen_ids = set()
+        seen_sequences = set()
+        for scene in v:
+            if scene.id in seen_ids:
+                raise ValueError('장면 ID는 고유해야 합니다')
+            seen_ids.add(scene.id)
+            
+            if scene.type == "conversation":
+                if scene.sequence in seen_sequences:
+                    raise ValueError('conversation 타입의 sequence는 고유해야 합니다')
+                seen_sequences.add(scene.sequence)
         
         return v
     
     def get_scenes_by_type(self, scene_type: str) -> List[Scene]:
-        """특정 타입의 장면들을 반환"""
+        """특정 타입의 장면들을 반환 (장면 목록이 바뀔 수 있으므로 호출마다 계산)"""
         return [scene for scene in self.scenes if scene.type == scene_type]
     
     def get_conversation_scenes_sorted(self) -> List[Scene]:
         """sequence 순으로 정렬된 conversation 장면들을 반환"""
-        conversation_scenes = self.get_scenes_by_type("conversation")
-        return sorted(conversation_scenes, key=lambda x: x.sequence)
+        return sorted(self.get_scenes_by_type("conversation"), key=attrgetter("sequence"))
     
     def get_total_duration_estimate(self) -> float:
         """전체 비디오 길이 추정 (초 단위)"""
@@ -141,8 +148,8 @@ class Manifest(BaseModel):
         return len(self.scenes) * 10.0
     
     def to_dict(self) -> dict:
-        """딕셔너리 형태로 변환"""
-        return self.dict()
+        """딕셔너리 형태로 변환 (JSON으로 바로 쓸 수 있는 값만 포함)"""
+        return self.model_dump(mode='json')
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Manifest':
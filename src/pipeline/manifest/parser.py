@@ -4,11 +4,45 @@ Manifest 파일을 파싱하고 검증하는 Parser 클래스
 
 import json
 import os
+from collections import Counter, OrderedDict
 from typing import Dict, List, Optional, Union, Tuple
 from pathlib import Path
 
-from .models import Manifest, Scene, DialogueLine
-from .validator import ManifestValidator
+from pydantic import ValidationError as PydanticValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .models import PATTERN_ERROR_MESSAGES, Manifest, Scene, DialogueLine
+from .validator import ManifestValidator, ValidationResult
+
+
+# 파일 경로별로 보관하는 파싱 결과 최대 개수 (오래 사용하지 않은 것부터 제거)
+_MANIFEST_CACHE_SIZE = 128
+
+
+def _localize_pattern_errors(error: PydanticValidationError) -> PydanticValidationError:
+    """Field(pattern=...) 위반 오류를 기존 한국어 검증 메시지(value_error)로 바꾼 ValidationError 반환"""
+    line_errors = []
+    localized = False
+    for err in error.errors():
+        message = None
+        if err['type'] == 'string_pattern_mismatch':
+            message = PATTERN_ERROR_MESSAGES.get(err.get('ctx', {}).get('pattern'))
+        if message:
+            line_errors.append({'type': 'value_error', 'loc': err['loc'], 'input': err['input'],
+                                'ctx': {'error': ValueError(message)}})
+            localized = True
+        else:
+            line_error = {'type': err['type'], 'loc': err['loc'], 'input': err['input']}
+            if 'ctx' in err:
+                line_error['ctx'] = err['ctx']
+            line_errors.append(line_error)
+    if not localized:
+        return error
+    return PydanticValidationError.from_exception_data(error.title, line_errors)
 
 
 class ManifestParser:
@@ -16,86 +50,90 @@ class ManifestParser:
     
     def __init__(self):
         self.validator = ManifestValidator()
-        self._parsed_manifests: Dict[str, Manifest] = {}
+        # 파일 경로 -> (수정 시각 ns, 크기, Manifest) (파일이 바뀌지 않았으면 다시 읽지 않음)
+        self._parsed_manifests: "OrderedDict[str, Tuple[int, int, Manifest]]" = OrderedDict()
     
     def parse_file(self, file_path: str) -> Manifest:
-        """파일에서 Manifest를 파싱"""
+        """
+        파일에서 Manifest를 파싱
+        파일이 없으면 FileNotFoundError, JSON/스키마/검증 오류는 ValueError(pydantic.ValidationError 포함)
+        """
+        # 파일 존재 확인 (stat 한 번으로 캐시 유효성까지 판단)
         try:
-            # 파일 존재 확인
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Manifest 파일을 찾을 수 없습니다: {file_path}")
-            
-            # JSON 파일 읽기
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Manifest 객체 생성
-            manifest = Manifest.from_dict(data)
-            
-            # 검증 수행
-            validation_result = self.validator.validate(manifest)
-            if not validation_result.is_valid:
-                raise ValueError(f"Manifest 검증 실패: {validation_result.errors}")
-            
-            # 캐시에 저장
-            self._parsed_manifests[file_path] = manifest
-            
-            return manifest
-            
-        except json.JSONDecodeError as e:
-            raise ValueError(f"JSON 파싱 오류: {e}")
-        except Exception as e:
-            raise ValueError(f"Manifest 파싱 오류: {e}")
+            st = os.stat(file_path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Manifest 파일을 찾을 수 없습니다: {file_path}") from e
+        
+        cached = self._parsed_manifests.get(file_path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            self._parsed_manifests.move_to_end(file_path)
+            return cached[2]
+        
+        # JSON 파일 읽기 (바이트로 한 번에 읽어 텍스트 디코딩 단계 없이 파싱, orjson이 있으면 사용)
+        data = self._loads(Path(file_path).read_bytes())
+        
+        # Manifest 객체 생성 및 검증
+        manifest, _ = self._build_and_validate(data)
+        
+        # 캐시에 저장
+        self._parsed_manifests[file_path] = (st.st_mtime_ns, st.st_size, manifest)
+        self._parsed_manifests.move_to_end(file_path)
+        if len(self._parsed_manifests) > _MANIFEST_CACHE_SIZE:
+            self._parsed_manifests.popitem(last=False)
+        
+        return manifest
     
     def parse_string(self, json_string: str) -> Manifest:
         """JSON 문자열에서 Manifest를 파싱"""
-        try:
-            data = json.loads(json_string)
-            manifest = Manifest.from_dict(data)
-            
-            # 검증 수행
-            validation_result = self.validator.validate(manifest)
-            if not validation_result.is_valid:
-                raise ValueError(f"Manifest 검증 실패: {validation_result.errors}")
-            
-            return manifest
-            
-        except json.JSONDecodeError as e:
-            raise ValueError(f"JSON 파싱 오류: {e}")
-        except Exception as e:
-            raise ValueError(f"Manifest 파싱 오류: {e}")
+        manifest, _ = self._build_and_validate(self._loads(json_string))
+        return manifest
     
     def parse_dict(self, data: dict) -> Manifest:
         """딕셔너리에서 Manifest를 파싱"""
+        manifest, _ = self.parse_dict_with_result(data)
+        return manifest
+    
+    def parse_dict_with_result(self, data: dict) -> Tuple[Manifest, ValidationResult]:
+        """딕셔너리에서 Manifest를 파싱하고, 경고를 다시 검증하지 않고 쓸 수 있도록 검증 결과도 함께 반환"""
+        return self._build_and_validate(data)
+    
+    @staticmethod
+    def _loads(raw: Union[str, bytes]) -> dict:
+        """JSON 파싱 (문법 오류는 ValueError로 변환, orjson.JSONDecodeError도 json.JSONDecodeError의 하위 클래스)"""
         try:
-            manifest = Manifest.from_dict(data)
-            
-            # 검증 수행
-            validation_result = self.validator.validate(manifest)
-            if not validation_result.is_valid:
-                raise ValueError(f"Manifest 검증 실패: {validation_result.errors}")
-            
-            return manifest
-            
-        except Exception as e:
-            raise ValueError(f"Manifest 파싱 오류: {e}")
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 파싱 오류: {e}") from e
+    
+    def _build_and_validate(self, data: dict) -> Tuple[Manifest, ValidationResult]:
+        """Manifest 객체 생성과 검증을 한 번에 수행"""
+        # model_validate는 dict가 아닌 입력도 TypeError 대신 pydantic.ValidationError(ValueError)로 보고함
+        try:
+            manifest = Manifest.model_validate(data)
+        except PydanticValidationError as e:
+            raise _localize_pattern_errors(e) from None
+        validation_result = self.validator.validate(manifest)
+        if not validation_result.is_valid:
+            raise ValueError(f"Manifest 검증 실패: {validation_result.errors}")
+        return manifest, validation_result
     
     def save_manifest(self, manifest: Manifest, file_path: str) -> None:
         """Manifest를 파일로 저장"""
         try:
-            # 디렉토리 생성
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # 디렉토리 생성 (파일명만 주어진 경우에도 동작)
+            path = Path(file_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
             
-            # JSON으로 저장
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest.to_dict(), f, ensure_ascii=False, indent=2)
+            # JSON으로 저장 (중간 dict 없이 pydantic-core가 모델에서 바로 직렬화, 한글은 이스케이프하지 않음)
+            path.write_bytes(manifest.model_dump_json(indent=2).encode('utf-8'))
                 
         except Exception as e:
             raise ValueError(f"Manifest 저장 오류: {e}")
     
     def get_cached_manifest(self, file_path: str) -> Optional[Manifest]:
         """캐시된 Manifest 반환"""
-        return self._parsed_manifests.get(file_path)
+        cached = self._parsed_manifests.get(file_path)
+        return cached[2] if cached else None
     
     def clear_cache(self) -> None:
         """캐시 클리어"""
@@ -106,23 +144,25 @@ class ManifestParser:
         try:
             manifest = self.parse_file(file_path)
             return True, []
-        except ValueError as e:
+        except (ValueError, FileNotFoundError) as e:
             return False, [str(e)]
         except Exception as e:
             return False, [f"예상치 못한 오류: {e}"]
     
     def get_manifest_info(self, manifest: Manifest) -> Dict[str, Union[str, int, float]]:
         """Manifest 정보 요약 반환"""
+        # 타입별 장면 수는 장면 목록을 한 번만 순회해서 계산
+        type_counts = Counter(scene.type for scene in manifest.scenes)
         return {
             "project_name": manifest.project_name,
-            "resolution": manifest.resolution,
+            "resolution": getattr(manifest, "resolution", None),
             "total_scenes": len(manifest.scenes),
             "scene_types": {
-                scene_type: len(manifest.get_scenes_by_type(scene_type))
+                scene_type: type_counts[scene_type]
                 for scene_type in ["intro", "conversation", "dialogue", "ending"]
             },
             "estimated_duration": manifest.get_total_duration_estimate(),
-            "has_background": manifest.default_background is not None
+            "has_background": getattr(manifest, "default_background", None) is not None
         }
     
     def create_template_manifest(self, project_name: str) -> Manifest:
@@ -169,21 +209,22 @@ class ManifestParser:
         
         for manifest in manifests:
             for scene in manifest.scenes:
-                # ID 충돌 방지를 위해 새로운 ID 생성
+                # ID 충돌 방지를 위해 새로운 ID 생성 (원본 Manifest의 장면은 바꾸지 않도록 복사본에 적용)
                 new_id = f"{scene.type}_{scene_id_counter:02d}"
-                scene.id = new_id
-                all_scenes.append(scene)
+                all_scenes.append(scene.model_copy(update={"id": new_id}))
                 scene_id_counter += 1
         
-        # 병합된 Manifest 생성
-        merged_data = {
-            "project_name": f"{base_manifest.project_name}_merged",
-            "resolution": base_manifest.resolution,
-            "default_background": base_manifest.default_background,
-            "scenes": all_scenes
-        }
+        # 장면들은 이미 검증된 객체이므로 Pydantic 재검증 없이 조립하고,
+        # 병합으로 생길 수 있는 문제(sequence 중복, 장면 수 초과 등)만 Validator로 확인
+        merged_manifest = Manifest.model_construct(
+            project_name=f"{base_manifest.project_name}_merged",
+            scenes=all_scenes
+        )
+        validation_result = self.validator.validate(merged_manifest)
+        if not validation_result.is_valid:
+            raise ValueError(f"Manifest 검증 실패: {validation_result.errors}")
         
-        return self.parse_dict(merged_data)
+        return merged_manifest
     
     def create_manifest(self, script_type: str, script_data: Dict[str, any]) -> Dict[str, any]:
         """
@@ -6,6 +6,7 @@ PNG 직접 렌더링 시스템 (v11 - 최종 안정화 버전)
 - 회화 장면의 분리된 바탕 박스 문제 해결
 - 상세 디버그 로그 및 안정적인 예외 처리 포함
 """
+import io
 import os
 import json
 import traceback
@@ -271,9 +272,20 @@ class PNGRenderer:
             image = self._create_base_image(resolution, tab_name)
             image = self.render_scene(image, scenes, tab_name)
             
-            # 이미지 저장
+            # 이미지 저장 (내용이 같은 기존 파일은 다시 쓰지 않아 수정 시각이 유지됨 → 렌더링 캐시 적중)
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            image.save(output_path, 'PNG')
+            buffer = io.BytesIO()
+            image.save(buffer, 'PNG')
+            png_bytes = buffer.getvalue()
+            try:
+                if os.path.getsize(output_path) == len(png_bytes):
+                    with open(output_path, 'rb') as f:
+                        if f.read() == png_bytes:
+                            return True
+            except OSError:
+                pass
+            with open(output_path, 'wb') as f:
+                f.write(png_bytes)
             
             return True
         except Exception as e:
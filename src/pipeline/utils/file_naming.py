@@ -175,11 +175,12 @@ class FileNamingManager:
                 return True
             
             # 임시 파일 목록
+            # scandir의 DirEntry는 파일 종류를 캐시하므로 항목당 isfile/getmtime 호출을 줄임
             temp_files = []
-            for filename in os.listdir(temp_dir):
-                file_path = os.path.join(temp_dir, filename)
-                if os.path.isfile(file_path):
-                    temp_files.append((file_path, os.path.getmtime(file_path)))
+            with os.scandir(temp_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        temp_files.append((entry.path, entry.stat().st_mtime))
             
             # 수정 시간순 정렬
             temp_files.sort(key=lambda x: x[1], reverse=True)
@@ -197,6 +198,12 @@ class FileNamingManager:
             print(f"❌ 임시 파일 정리 실패: {e}")
             return False
     
+    @staticmethod
+    def _count_files(dir_path: str) -> int:
+        """디렉토리 내 파일 수 (os.scandir 한 번으로 계산)"""
+        with os.scandir(dir_path) as it:
+            return sum(1 for entry in it if entry.is_file())
+    
     def get_project_summary(self, project_name: str) -> Dict[str, Any]:
         """
         프로젝트 파일 요약 정보 반환
@@ -230,7 +237,7 @@ class FileNamingManager:
                     summary["directories"][dir_name] = {
                         "path": dir_path,
                         "exists": True,
-                        "file_count": len([f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))])
+                        "file_count": self._count_files(dir_path)
                     }
                 else:
                     summary["directories"][dir_name] = {
@@ -2,32 +2,257 @@
 
 import os
 import json
+import functools
+import shutil
 import subprocess
-from typing import Dict, Any, List, Optional
+import threading
+import traceback
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from PIL import Image
 
+try:
+    from mutagen.mp3 import MP3
+    from mutagen import MutagenError
+except ImportError:
+    MP3, MutagenError = None, Exception
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _link_or_copy(src: str, dst: str):
+    """하드링크 → 심볼릭 링크 → 복사 순으로 시도 (같은 파일시스템이면 데이터 복사 없음)"""
+    try:
+        os.link(src, dst)
+        return
+    except FileExistsError:
+        os.unlink(dst)
+        return _link_or_copy(src, dst)
+    except OSError:
+        # EXDEV(다른 파일시스템) 또는 하드링크 미지원 파일시스템
+        pass
+    try:
+        os.symlink(os.path.abspath(src), dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _load_json_file(path: str) -> Any:
+    """JSON 파일 로드 (orjson이 있으면 사용, 없으면 표준 json)"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def log_ffmpeg_command(title: str, command: List[str]):
+    """단계 제목(인자 수 포함)과 전체 명령어 문자열을 다른 진행 로그와 같은 print 경로로 출력"""
+    print(f"{title} ({len(command)}개 인자):")
+    print(" ".join(command))
+
+
+# 프로세스 전체에서 동시에 실행되는 ffmpeg 인코딩 수
+# 코어 4개당 1개를 기본으로 하되, 코어가 적은 PC에서도 인트로/회화/엔딩 3개는 함께 돌 수 있게 함
+_CPU_COUNT = os.cpu_count() or 1
+FFMPEG_MAX_JOBS = max(min(3, _CPU_COUNT), _CPU_COUNT // 4)
+
+# 음성/렌더링 병렬화가 겹쳐도 FFMPEG_MAX_JOBS개 이상의 인코더가 뜨지 않도록 제한
+_FFMPEG_JOB_SLOTS = threading.BoundedSemaphore(FFMPEG_MAX_JOBS)
+
+# 병렬 경로의 작업 스레드에서만 설정하는 ffmpeg 작업당 스레드 수 (없으면 ffmpeg 자동 설정 사용)
+_ffmpeg_thread_budget = threading.local()
+
+
+@contextmanager
+def ffmpeg_threads_per_job(concurrent_jobs: int):
+    """
+    이 스레드에서 만드는 MP4 출력 명령의 스레드 수를 동시 작업 수로 나눈 코어 수로 제한
+    (동시에 도는 인코딩끼리 코어를 과다 구독하지 않도록, 병렬 렌더링 경로에서만 사용)
+    """
+    previous = getattr(_ffmpeg_thread_budget, 'threads', None)
+    _ffmpeg_thread_budget.threads = max(1, _CPU_COUNT // max(1, concurrent_jobs))
+    try:
+        yield
+    finally:
+        _ffmpeg_thread_budget.threads = previous
+
+
+# 실패 시 보여줄 ffmpeg 로그 줄 수 (긴 인코딩의 stderr 전체를 메모리에 쌓지 않음)
+FFMPEG_LOG_TAIL_LINES = 200
+
+
+def run_ffmpeg_job(command: List[str], input: Optional[str] = None,
+                   timeout: Optional[float] = None, check: bool = False) -> subprocess.CompletedProcess:
+    """
+    인코딩용 ffmpeg 실행 (동시 실행 슬롯이 빌 때까지 대기)
+    stderr는 줄 단위로 읽으며 진행 상황(frame=/size=) 줄을 제외한 마지막 FFMPEG_LOG_TAIL_LINES 줄만 보관합니다.
+    반환값과 예외는 subprocess.run(..., capture_output=True, text=True)와 같은 형태입니다. (stdout은 버림)
+    """
+    with _FFMPEG_JOB_SLOTS:
+        proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace',
+        )
+
+        def _feed_stdin():
+            try:
+                proc.stdin.write(input)
+                proc.stdin.close()
+            except OSError:
+                pass  # ffmpeg가 입력을 다 읽기 전에 종료한 경우 (오류는 stderr/종료 코드로 확인)
+
+        if input is not None:
+            threading.Thread(target=_feed_stdin, daemon=True).start()
+
+        timed_out = threading.Event()
+
+        def _on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, _on_timeout) if timeout else None
+        if timer:
+            timer.start()
+        tail = deque(maxlen=FFMPEG_LOG_TAIL_LINES)
+        try:
+            for line in proc.stderr:
+                if not line.startswith(('frame=', 'size=')):
+                    tail.append(line)
+            returncode = proc.wait()
+        finally:
+            if timer:
+                timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stderr.close()
+
+    stderr = ''.join(tail)
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, timeout, stderr=stderr)
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+    return subprocess.CompletedProcess(command, returncode, stderr=stderr)
+
+
+@functools.lru_cache(maxsize=4)
+def _probe_ffmpeg(ffmpeg_path: str) -> Tuple[bool, str]:
+    """ffmpeg -version 실행 결과 (사용 가능 여부, 오류 종류)"""
+    try:
+        subprocess.run([ffmpeg_path, '-version'], capture_output=True, check=True)
+        return True, ''
+    except FileNotFoundError:
+        return False, 'not_found'
+    except subprocess.CalledProcessError:
+        return False, 'error'
+
+
+# H.264 인코더 선호 순서 (하드웨어 인코더 우선, 모두 사용할 수 없으면 libx264)
+_HW_H264_ENCODERS = ('h264_videotoolbox', 'h264_nvenc', 'h264_qsv')
+
+
+@functools.lru_cache(maxsize=4)
+def detect_h264_encoder(ffmpeg_path: str) -> str:
+    """
+    실제로 동작하는 H.264 하드웨어 인코더를 찾습니다.
+    빌드에 포함되어 있어도 장치가 없으면 실패하므로, 목록 확인 후 1프레임 시험 인코딩으로 검증합니다.
+    """
+    try:
+        result = subprocess.run([ffmpeg_path, '-hide_banner', '-encoders'], capture_output=True, text=True, timeout=10)
+        available = result.stdout
+    except Exception:
+        return 'libx264'
+
+    for encoder in _HW_H264_ENCODERS:
+        if f" {encoder} " not in available:
+            continue
+        test_cmd = [
+            ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+            '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'
+        ]
+        try:
+            if subprocess.run(test_cmd, capture_output=True, timeout=15).returncode == 0:
+                return encoder
+        except Exception:
+            continue
+    return 'libx264'
+
+
+def h264_encoder_args(encoder: str, bitrate: str) -> List[str]:
+    """인코더별 비디오 인코딩 인자"""
+    if encoder == 'h264_nvenc':
+        return ['-c:v', encoder, '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-b:v', bitrate]
+    if encoder == 'libx264':
+        return ['-c:v', encoder, '-preset', 'medium', '-b:v', bitrate]
+    return ['-c:v', encoder, '-b:v', bitrate]
+
+
+# 모든 세그먼트/재인코딩 병합 출력이 공유하는 프레임레이트·픽셀 포맷·오디오 형식
+# (세그먼트 형식이 같아야 최종 병합이 재인코딩 없이 concat demuxer + 스트림 복사로 처리됨)
+SEGMENT_FORMAT_ARGS = ['-r', '25', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-ar', '44100', '-ac', '2']
+
+
+def mp4_output_args(faststart: bool = True) -> List[str]:
+    """
+    모든 MP4 출력 명령에 공통으로 붙이는 인자
+    - ffmpeg_threads_per_job 안(병렬 경로)에서는 작업당 스레드 수를 고정해 과다 구독 방지
+      필터 그래프(scale/overlay/concat)도 같은 수의 스레드로 실행
+      단독으로 도는 작업(최종 병합, 단일 렌더링 등)은 ffmpeg 자동 스레드 설정을 그대로 사용
+    - faststart: moov 아톰을 앞으로 옮겨 다운로드 완료 전에도 재생 가능하게 함
+      (파일을 한 번 더 다시 쓰므로, 최종 병합에서만 쓰이는 중간 세그먼트는 생략)
+    """
+    args = []
+    threads = getattr(_ffmpeg_thread_budget, 'threads', None)
+    if threads:
+        threads = str(threads)
+        args += ['-threads', threads, '-filter_threads', threads, '-filter_complex_threads', threads]
+    if faststart:
+        args += ['-movflags', '+faststart']
+    return args
+
+
 class VideoGenerator:
     """
     타임라인 JSON 파일을 기반으로 FFmpeg을 사용하여 최종 비디오를 생성합니다.
     """
     
-    def __init__(self):
+    def __init__(self, enable_hardware_acceleration: bool = True):
+        # ffmpeg/ffprobe 실행 파일 경로는 한 번만 찾아서 재사용 (호출마다 PATH 탐색 방지)
+        self._ffmpeg = shutil.which('ffmpeg') or 'ffmpeg'
+        self._ffprobe = shutil.which('ffprobe') or 'ffprobe'
         self._check_ffmpeg_availability()
+        self.h264_encoder = detect_h264_encoder(self._ffmpeg) if enable_hardware_acceleration else 'libx264'
+        print(f"✅ H.264 인코더: {self.h264_encoder}")
     
     def _check_ffmpeg_availability(self):
-        """FFmpeg 설치 및 사용 가능 여부 확인"""
-        try:
-            subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        """FFmpeg 설치 및 사용 가능 여부 확인 (프로세스 실행은 실행 파일당 한 번만)"""
+        available, error = _probe_ffmpeg(self._ffmpeg)
+        if available:
             print("✅ FFmpeg 사용 가능")
-        except FileNotFoundError:
+        elif error == 'not_found':
             raise FileNotFoundError("FFmpeg이 설치되지 않았거나 PATH에 없습니다.")
-        except subprocess.CalledProcessError:
+        else:
             raise RuntimeError("FFmpeg 실행 중 오류가 발생했습니다.")
     
     def _get_accurate_audio_duration(self, audio_path: str) -> float:
         try:
             if not os.path.exists(audio_path): return 0.0
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', audio_path]
+            # mutagen이 있으면 MP3 헤더만 읽어 길이를 구하고, ffprobe 프로세스 생성은 실패 시에만
+            if MP3 is not None and audio_path.lower().endswith('.mp3'):
+                try:
+                    return round(float(MP3(audio_path).info.length), 3)
+                except MutagenError:
+                    pass
+            cmd = [self._ffprobe, '-v', 'quiet', '-print_format', 'json', '-show_format', audio_path]
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             return round(float(json.loads(result.stdout)['format']['duration']), 3)
         except Exception:
@@ -37,6 +262,20 @@ class VideoGenerator:
     
     
     
+    def _prepare_frame_image(self, image_path: str, processed_img_path: str, target_resolution: tuple) -> bool:
+        """
+        프레임 이미지를 임시 폴더에 준비합니다.
+        이미 목표 해상도인 이미지는 다시 인코딩하지 않고 링크로 연결합니다. (링크했으면 True)
+        """
+        with Image.open(image_path) as img:
+            # 확장자로 디코더를 고르므로 PNG가 아닌 원본은 재인코딩
+            if img.size != tuple(target_resolution) or img.format != 'PNG':
+                img.resize(target_resolution, Image.Resampling.LANCZOS).save(processed_img_path, 'PNG')
+                return False
+
+        _link_or_copy(image_path, processed_img_path)
+        return True
+
     def create_simple_video(self, image_paths: List[str], audio_path: str, 
                            output_path: str, duration_per_image: float = 2.0) -> bool:
         """
@@ -66,23 +305,23 @@ class VideoGenerator:
             
             # FFmpeg 명령어 구성
             command = [
-                'ffmpeg', '-y',
+                self._ffmpeg, '-y',
                 '-i', audio_path,
                 *[item for img in image_paths for item in ['-loop', '1', '-t', str(duration_per_image), '-i', img]],
                 '-filter_complex', f'[1:v][2:v][3:v]concat=n={len(image_paths)}:v=1:a=0[v]',
                 '-map', '[v]',
                 '-map', '0:a',
-                '-c:v', 'libx264',
-                '-c:a', 'aac',
+                *h264_encoder_args(self.h264_encoder, '8000k'),
+                *SEGMENT_FORMAT_ARGS,
                 '-shortest',
+                *mp4_output_args(faststart=False),  # 최종 병합 입력용 중간 세그먼트
                 output_path
             ]
             
-            print("🚀 [FFmpeg] 간단 비디오 생성 명령어:")
-            print(" ".join(command))
+            log_ffmpeg_command("🚀 [FFmpeg] 간단 비디오 생성 실행", command)
             
             # FFmpeg 실행
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            result = run_ffmpeg_job(command, check=True)
             print(f"✅ [성공] 간단 비디오 생성 완료: {output_path}")
             return True
             
@@ -104,8 +343,7 @@ class VideoGenerator:
         temp_dir = None
 
         try:
-            with open(timing_path, 'r', encoding='utf-8') as f:
-                timing_entries = json.load(f)
+            timing_entries = _load_json_file(timing_path)
             print(f"✅ 타이밍 데이터 로드 완료: {len(timing_entries)}개 항목")
 
             if not timing_entries:
@@ -132,59 +370,74 @@ class VideoGenerator:
 
             # 이미지 전처리 준비
             target_resolution = (1920, 1080)
-            temp_dir = os.path.join(os.path.dirname(output_video_path), "temp_images_for_concat")
+            # 스크립트 타입별 렌더링이 동시에 실행될 수 있으므로 출력 파일마다 별도의 임시 폴더 사용
+            output_stem = os.path.splitext(os.path.basename(output_video_path))[0]
+            temp_dir = os.path.join(os.path.dirname(output_video_path), f"temp_images_for_concat_{output_stem}")
             os.makedirs(temp_dir, exist_ok=True)
             print(f"⚙️ 이미지 전처리 시작... (목표 해상도: {target_resolution})")
 
-            input_images_args = []
-            filter_complex_video_streams = ""
-            valid_segments_count = 0
+            # (이미지 경로, 표시 시간) 목록
+            frame_segments = []
 
             # --- 로직 분기 ---
             if script_type == "conversation":
-                from itertools import groupby
-                from operator import itemgetter
+                # 정렬/그룹화 없이 한 번의 순회로 장면별 원어민·학습자 세그먼트를 색인
+                native_by_scene: Dict[Any, Dict[str, Any]] = {}
+                learners_by_scene: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+                scene_ids = set()
+                for s in timing_entries:
+                    scene_ids.add(s['scene_id'])
+                    if s['speaker'] == 'native':
+                        native_by_scene.setdefault(s['scene_id'], s)
+                    elif s['speaker'].startswith('learner_'):
+                        learners_by_scene[s['scene_id']].append(s)
+                print(f"🔄 'conversation' 타입 감지. {len(scene_ids)}개의 장면으로 그룹화합니다.")
 
-                timing_entries.sort(key=itemgetter('scene_id'))
-                grouped_scenes = {k: list(v) for k, v in groupby(timing_entries, key=itemgetter('scene_id'))}
-                print(f"🔄 'conversation' 타입 감지. {len(grouped_scenes)}개의 장면으로 그룹화합니다.")
-
-                for scene_id, segments in sorted(grouped_scenes.items()):
+                for scene_id in sorted(scene_ids):
                     # 1. 원어민 처리
-                    native_segment = next((s for s in segments if s['speaker'] == 'native'), None)
+                    native_segment = native_by_scene.get(scene_id)
                     if native_segment:
                         duration = native_segment['end_time'] - native_segment['start_time']
                         image_path = native_segment.get("image_filename")
                         if duration > 0 and image_path and os.path.exists(image_path):
-                            processed_img_path = os.path.join(temp_dir, f"frame_{valid_segments_count:04d}.png")
-                            with Image.open(image_path) as img: img.resize(target_resolution, Image.Resampling.LANCZOS).save(processed_img_path, 'PNG')
-                            input_images_args.extend(['-loop', '1', '-t', str(duration), '-i', os.path.abspath(processed_img_path)])
-                            filter_complex_video_streams += f"[{valid_segments_count+1}:v]"
-                            valid_segments_count += 1
+                            frame_segments.append((image_path, duration))
 
                     # 2. 학습자 그룹 처리
-                    learner_segments = [s for s in segments if s['speaker'].startswith('learner_')]
+                    learner_segments = learners_by_scene.get(scene_id)
                     if learner_segments:
                         learner_segments.sort(key=lambda s: s['speaker'])
                         duration = learner_segments[-1]['end_time'] - learner_segments[0]['start_time']
                         image_path = learner_segments[0].get("image_filename")
                         if duration > 0 and image_path and os.path.exists(image_path):
-                            processed_img_path = os.path.join(temp_dir, f"frame_{valid_segments_count:04d}.png")
-                            with Image.open(image_path) as img: img.resize(target_resolution, Image.Resampling.LANCZOS).save(processed_img_path, 'PNG')
-                            input_images_args.extend(['-loop', '1', '-t', str(duration), '-i', os.path.abspath(processed_img_path)])
-                            filter_complex_video_streams += f"[{valid_segments_count+1}:v]"
-                            valid_segments_count += 1
+                            frame_segments.append((image_path, duration))
             else:
                 print(f"🔄 '{script_type}' 타입 감지. 1:1로 이미지를 매칭합니다.")
                 for segment in timing_entries:
                     duration = segment['end_time'] - segment['start_time']
                     image_path = segment.get("image_filename")
                     if duration > 0 and image_path and os.path.exists(image_path):
-                        processed_img_path = os.path.join(temp_dir, f"frame_{valid_segments_count:04d}.png")
-                        with Image.open(image_path) as img: img.resize(target_resolution, Image.Resampling.LANCZOS).save(processed_img_path, 'PNG')
-                        input_images_args.extend(['-loop', '1', '-t', str(duration), '-i', os.path.abspath(processed_img_path)])
-                        filter_complex_video_streams += f"[{valid_segments_count+1}:v]"
-                        valid_segments_count += 1
+                        frame_segments.append((image_path, duration))
+
+            # 같은 이미지가 연속되면 하나의 -loop 입력으로 합쳐 PNG 디코딩/입력 수를 줄임
+            merged_segments = []
+            for image_path, duration in frame_segments:
+                if merged_segments and merged_segments[-1][0] == image_path:
+                    merged_segments[-1][1] += duration
+                else:
+                    merged_segments.append([image_path, duration])
+
+            input_images_args = []
+            filter_complex_video_streams = ""
+            valid_segments_count = 0
+            linked_frames = 0
+            for image_path, duration in merged_segments:
+                processed_img_path = os.path.join(temp_dir, f"frame_{valid_segments_count:04d}.png")
+                linked_frames += self._prepare_frame_image(image_path, processed_img_path, target_resolution)
+                input_images_args.extend(['-loop', '1', '-t', str(duration), '-i', os.path.abspath(processed_img_path)])
+                filter_complex_video_streams += f"[{valid_segments_count+1}:v]"
+                valid_segments_count += 1
+
+            print(f"✅ 이미지 전처리 완료: {valid_segments_count}개 (링크 {linked_frames}개, 리사이즈 {valid_segments_count - linked_frames}개, 연속 중복 병합 {len(frame_segments) - len(merged_segments)}개)")
 
             if valid_segments_count == 0:
                 print(f"🔥🔥🔥 [오류] 처리할 유효한 이미지 세그먼트가 없습니다. FFmpeg을 실행할 수 없습니다.")
@@ -193,26 +446,23 @@ class VideoGenerator:
             filter_complex = f"{filter_complex_video_streams}concat=n={valid_segments_count}:v=1:a=0[v]"
 
             command = [
-                'ffmpeg', '-y',
+                self._ffmpeg, '-y',
                 '-i', audio_input,
                 *input_images_args,
                 '-filter_complex', filter_complex,
                 '-map', '[v]',
                 '-map', '0:a',
                 '-t', str(audio_duration),
-                '-c:v', 'h264_videotoolbox',
-                '-b:v', '8000k',
-                '-r', '25',
-                '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac', '-ar', '44100', '-ac', '2',
+                *h264_encoder_args(self.h264_encoder, '8000k'),
+                *SEGMENT_FORMAT_ARGS,
+                *mp4_output_args(faststart=False),  # 최종 병합 입력용 중간 세그먼트
                 output_video_path
             ]
             
-            print("🚀 [FFmpeg] 실행 명령어 (Concat 필터 방식 v5):")
-            print(" ".join(command))
+            log_ffmpeg_command("🚀 [FFmpeg] 실행 (Concat 필터 방식 v5)", command)
             print("🔄 FFmpeg 실행 중...")
 
-            subprocess.run(command, check=True, capture_output=True, text=True)
+            run_ffmpeg_job(command, check=True)
             print(f"✅ [성공] 비디오 생성 완료: {output_video_path}")
             return True
 
@@ -224,12 +474,10 @@ class VideoGenerator:
             print(f"🔥🔥🔥 [오류] 비디오 생성 중 예외 발생! 🔥🔥🔥")
             print(f"  - 오류 타입: {type(e).__name__}")
             print(f"  - 오류 메시지: {e}")
-            import traceback
             traceback.print_exc()
             return False
         finally:
             if temp_dir and os.path.exists(temp_dir):
-                import shutil
                 shutil.rmtree(temp_dir)
     
     def _find_background_image(self, script_type: str = None, timing_path: str = None) -> Optional[str]:
@@ -292,9 +540,7 @@ class VideoGenerator:
             print(f"🔍 설정 파일 경로: {settings_file}")
 
             if os.path.exists(settings_file):
-                import json
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings_data = json.load(f)
+                settings_data = _load_json_file(settings_file)
                 
                 # 탭별 배경 설정에서 현재 스크립트 타입에 맞는 설정 찾기
                 tab_backgrounds = settings_data.get('common', {}).get('tab_backgrounds', {})
@@ -16,6 +16,13 @@ class PipelineTabView(ctk.CTkFrame):
     def __init__(self, parent, root=None):
         super().__init__(parent, fg_color="transparent")
         self.root = root
+        # 로그는 버퍼에 모아 50ms마다 한 번에 출력 (메시지마다 위젯 갱신 방지)
+        # 작업 스레드는 버퍼에만 쓰고 Tk는 건드리지 않음, 위젯 갱신은 메인 스레드의 폴링 루프에서만 수행
+        # 폴링 루프는 작업 스레드가 도는 동안(또는 남은 로그가 있는 동안)만 실행
+        self._log_buffer = []
+        self._log_lock = threading.Lock()
+        self._active_workers = 0  # _log_lock으로 보호
+        self._log_poll_id = None  # 메인 스레드에서만 읽고 씀
         self.pipeline_manager = PipelineManager(root=root, log_callback=self.log_message)
         self.generated_data = None
         
@@ -242,12 +249,57 @@ class PipelineTabView(ctk.CTkFrame):
     def log_message(self, message):
         """로그 메시지를 추가합니다."""
         if hasattr(self, 'log_textbox'):
-            self.log_textbox.configure(state="normal")
-            self.log_textbox.insert(tk.END, f"{message}\n")
-            self.log_textbox.see(tk.END)
+            with self._log_lock:
+                self._log_buffer.append(f"{message}\n")
+            # 메인 스레드에서 남긴 로그는 작업 스레드가 없어도 출력되도록 루프 시작
+            if threading.current_thread() is threading.main_thread():
+                self._start_log_poll()
         else:
             print(message)
+
+    def _start_worker(self, target):
+        """작업 스레드를 시작하고, 작업이 끝날 때까지 로그 폴링 루프를 돌립니다. (메인 스레드에서만 호출)"""
+        def run():
+            try:
+                target()
+            finally:
+                with self._log_lock:
+                    self._active_workers -= 1
+
+        with self._log_lock:
+            self._active_workers += 1
+        self._start_log_poll()
+        threading.Thread(target=run, daemon=True).start()
+
+    def _start_log_poll(self):
+        """로그 폴링 루프가 멈춰 있으면 시작합니다. (메인 스레드에서만 호출)"""
+        if self._log_poll_id is None:
+            self._log_poll_id = self.after(50, self._poll_log)
+
+    def _poll_log(self):
+        """메인 스레드에서 로그 버퍼를 비우고, 실행 중인 작업이 없으면 루프를 멈춥니다."""
+        self._flush_log()
+        with self._log_lock:
+            keep_polling = self._active_workers > 0 or bool(self._log_buffer)
+        self._log_poll_id = self.after(50, self._poll_log) if keep_polling else None
+
+    def _flush_log(self):
+        """버퍼에 쌓인 로그를 한 번의 insert로 출력합니다."""
+        with self._log_lock:
+            text = "".join(self._log_buffer)
+            self._log_buffer.clear()
+        if text:
+            self.log_textbox.configure(state="normal")
+            self.log_textbox.insert(tk.END, text)
+            self.log_textbox.see(tk.END)
     
+    def destroy(self):
+        """로그 폴링 루프를 멈춘 뒤 위젯을 제거합니다."""
+        if self._log_poll_id is not None:
+            self.after_cancel(self._log_poll_id)
+            self._log_poll_id = None
+        super().destroy()
+
     def _get_ui_data(self):
         """UI에서 현재 데이터를 가져옵니다."""
         ui_data = {}
@@ -479,7 +531,7 @@ class PipelineTabView(ctk.CTkFrame):
                 import traceback
                 self.log_message(f"[{step_name}] 작업 중 예외 발생: {e}\n{traceback.format_exc()}")
 
-        threading.Thread(target=target, daemon=True).start()
+        self._start_worker(target)
 
     def _create_manifest(self):
         """모든 스크립트 타입의 데이터를 취합하여 마스터 Manifest 생성을 요청합니다."""
@@ -529,7 +581,7 @@ class PipelineTabView(ctk.CTkFrame):
                 self.log_message(f"--- 🚨 Manifest 생성 중 심각한 오류 발생: {e} ---")
                 self.log_message(traceback.format_exc())
 
-        threading.Thread(target=target, daemon=True).start()
+        self._start_worker(target)
 
     def _create_audio(self):
         self._run_pipeline_step(self.pipeline_manager.run_audio_generation, "오디오 생성")
@@ -567,7 +619,7 @@ class PipelineTabView(ctk.CTkFrame):
                 import traceback
                 self.log_message(f"[{step_name}] 작업 중 예외 발생: {e}\n{traceback.format_exc()}")
                 
-        threading.Thread(target=target, daemon=True).start()
+        self._start_worker(target)
 
     def _read_ai_data(self):
         """AI 데이터 읽기 기능 - 기존 activate 메서드의 로직 활용"""
@@ -678,7 +730,7 @@ class PipelineTabView(ctk.CTkFrame):
                 self.log_message(f"--- 🚨 썸네일 생성 중 심각한 오류 발생: {e} ---")
                 self.log_message(traceback.format_exc())
 
-        threading.Thread(target=target, daemon=True).start()
+        self._start_worker(target)
 
     def _exit_app(self):
         if self.root:
@@ -903,10 +955,10 @@ class PipelineTabView(ctk.CTkFrame):
 
     def _run_auto_generation(self):
         """자동 생성 파이프라인을 별도 스레드에서 시작합니다."""
-        threading.Thread(target=self._auto_generation_thread, daemon=True).start()
+        self._start_worker(self._auto_generation_thread)
 
     def _auto_generation_thread(self):
-        """자동 생성 파이프라인의 전체 시퀀스를 순차적으로 실행합니다."""
+        """자동 생성 파이프라인의 전체 시퀀스를 실행합니다. (오디오 생성과 비디오 렌더링은 타입별 병렬 처리)"""
         try:
             self.log_message("--- 🚀 자동 생성 파이프라인 시작 ---")
             
@@ -931,7 +983,8 @@ class PipelineTabView(ctk.CTkFrame):
                 script_settings = {}
                 self.log_message("--- ⚠️ 이미지 탭 설정을 찾을 수 없습니다. ---")
 
-            # --- Run generation for each script type ---
+            # --- 1단계: 스크립트 타입별 Manifest 생성 ---
+            step_ui_data_by_type = {}
             for script_type in ["intro", "conversation", "ending"]:
                 self.log_message(f"--- ⏳ ({script_type}) 처리 시작 ---")
                 
@@ -951,21 +1004,30 @@ class PipelineTabView(ctk.CTkFrame):
                 if not result.get('success'):
                     self.log_message(f"--- ❌ ({script_type}) Manifest 생성 실패: {result.get('errors')}. 자동 생성을 중단합니다. ---")
                     return
+                step_ui_data_by_type[script_type] = step_ui_data
 
-                self.log_message(f"  - ({script_type}) 오디오 생성 중...")
-                result = self.pipeline_manager.run_audio_generation(step_ui_data)
+            # --- 2단계: 오디오는 타입 간 의존성이 없으므로 병렬 생성 ---
+            self.log_message(f"  - ({', '.join(step_ui_data_by_type)}) 오디오 병렬 생성 중...")
+            audio_results = self.pipeline_manager.run_audio_generation_parallel(step_ui_data_by_type)
+            for script_type in step_ui_data_by_type:
+                result = audio_results.get(script_type, {})
                 if not result.get('success'):
                     self.log_message(f"--- ❌ ({script_type}) 오디오 생성 실패: {result.get('errors')}. 자동 생성을 중단합니다. ---")
                     return
 
+            # --- 3단계: 타입별 자막 이미지 생성 ---
+            for script_type, step_ui_data in step_ui_data_by_type.items():
                 self.log_message(f"  - ({script_type}) 자막 이미지 생성 중...")
                 result = self.pipeline_manager.run_subtitle_creation(step_ui_data)
                 if not result.get('success'):
                     self.log_message(f"--- ❌ ({script_type}) 자막 이미지 생성 실패: {result.get('errors')}. 자동 생성을 중단합니다. ---")
                     return
 
-                self.log_message(f"  - ({script_type}) 비디오 렌더링 중...")
-                result = self.pipeline_manager.run_timing_based_video_rendering(step_ui_data)
+            # --- 4단계: 타입별 비디오는 서로 독립적이므로 병렬 렌더링 ---
+            self.log_message(f"  - ({', '.join(step_ui_data_by_type)}) 비디오 병렬 렌더링 중...")
+            render_results = self.pipeline_manager.run_timing_based_video_rendering_parallel(step_ui_data_by_type)
+            for script_type in step_ui_data_by_type:
+                result = render_results.get(script_type, {})
                 if not result.get('success'):
                     self.log_message(f"--- ❌ ({script_type}) 비디오 렌더링 실패: {result.get('errors', result.get('message'))}. 자동 생성을 중단합니다. ---")
                     return